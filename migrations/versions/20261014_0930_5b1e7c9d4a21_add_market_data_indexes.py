@@ -0,0 +1,46 @@
+"""add market data indexes
+
+Revision ID: 5b1e7c9d4a21
+Revises: 86643eb0ac9d
+Create Date: 2026-10-14 09:30:12.118204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1e7c9d4a21"
+down_revision: Union[str, None] = "86643eb0ac9d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_md_exch_sym_ts",
+        "market_data",
+        ["exchange", "symbol", sa.text("timestamp DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_md_ohlcv_cover",
+        "market_data",
+        ["exchange", "symbol", "timestamp"],
+        unique=False,
+        postgresql_include=["open", "high", "low", "close", "volume"],
+    )
+    op.create_index(
+        "ix_trade_active",
+        "trades",
+        ["status", "exit_time"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trade_active", table_name="trades")
+    op.drop_index("ix_md_ohlcv_cover", table_name="market_data")
+    op.drop_index("ix_md_exch_sym_ts", table_name="market_data")
@@ -0,0 +1,48 @@
+"""market data hypertable
+
+Revision ID: 9c4d2e6f8b13
+Revises: 5b1e7c9d4a21
+Create Date: 2026-10-14 10:15:47.602931
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c4d2e6f8b13"
+down_revision: Union[str, None] = "5b1e7c9d4a21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS timescaledb")
+
+    # Unique constraints on a hypertable must include the partitioning column
+    op.drop_constraint("market_data_pkey", "market_data", type_="primary")
+    op.create_primary_key("market_data_pkey", "market_data", ["id", "timestamp"])
+
+    op.execute(
+        "SELECT create_hypertable('market_data', 'timestamp', "
+        "chunk_time_interval => INTERVAL '1 day', migrate_data => true)"
+    )
+    op.execute(
+        "ALTER TABLE market_data SET ("
+        "timescaledb.compress, "
+        "timescaledb.compress_segmentby = 'exchange,symbol', "
+        "timescaledb.compress_orderby = 'timestamp DESC')"
+    )
+    op.execute("SELECT add_compression_policy('market_data', INTERVAL '7 days')")
+
+
+def downgrade() -> None:
+    # Compression is undone here; the table stays a hypertable, since converting
+    # it back to a plain table means copying every row into a new table.
+    op.execute("SELECT remove_compression_policy('market_data', if_exists => true)")
+    op.execute(
+        "SELECT decompress_chunk(c, true) FROM show_chunks('market_data') c"
+    )
+    op.execute("ALTER TABLE market_data SET (timescaledb.compress = false)")
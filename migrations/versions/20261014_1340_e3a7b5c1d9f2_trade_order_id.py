@@ -0,0 +1,28 @@
+"""trade order id
+
+Revision ID: e3a7b5c1d9f2
+Revises: 9c4d2e6f8b13
+Create Date: 2026-10-14 13:40:21.573310
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a7b5c1d9f2"
+down_revision: Union[str, None] = "9c4d2e6f8b13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("trades", sa.Column("order_id", sa.String(), nullable=True))
+    op.create_index("ix_trade_order_id", "trades", ["order_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trade_order_id", table_name="trades")
+    op.drop_column("trades", "order_id")
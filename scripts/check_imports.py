@@ -1,20 +1,86 @@
-import importlib
-import os
+import ast
+import importlib.util
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import List, Set
 
-def check_imports(directory: str = "src"):
-    """Check all Python files for import errors"""
+@lru_cache(maxsize=None)
+def _find_module(name: str) -> str:
+    """Resolve a module without running its top-level code; returns an error or ''"""
+    try:
+        if importlib.util.find_spec(name) is None:
+            return f"No module named '{name}'"
+    except (ImportError, ValueError) as e:
+        return str(e)
+    return ""
+
+_IMPORT_ERRORS = {"ImportError", "ModuleNotFoundError"}
+
+def _guarded_imports(tree: ast.AST) -> Set[int]:
+    """ids of nodes inside a try body whose handlers catch ImportError (optional imports)"""
+    guarded = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Try):
+            continue
+        caught = set()
+        for handler in node.handlers:
+            types = handler.type.elts if isinstance(handler.type, ast.Tuple) else [handler.type]
+            caught.update(t.id for t in types if isinstance(t, ast.Name))
+        if caught & _IMPORT_ERRORS:
+            guarded.update(id(child) for stmt in node.body for child in ast.walk(stmt))
+    return guarded
+
+def _check_file(args) -> List[str]:
+    """Compile one file and resolve every module it imports"""
+    path, module_path = args
+    try:
+        tree = ast.parse(Path(path).read_text(), filename=path)
+        compile(tree, path, "exec")
+    except SyntaxError as e:
+        return [f"{module_path}: {e}"]
+
+    is_package = Path(path).name == "__init__.py"
+    package = module_path if is_package else module_path.rpartition(".")[0]
+
+    guarded = _guarded_imports(tree)
     errors = []
+    for node in ast.walk(tree):
+        if id(node) in guarded:
+            continue
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            name = "." * node.level + (node.module or "")
+            try:
+                names = [importlib.util.resolve_name(name, package)]
+            except ImportError as e:
+                errors.append(f"{module_path}: {e}")
+                continue
+        else:
+            continue
+
+        for name in names:
+            error = _find_module(name)
+            if error:
+                errors.append(f"{module_path}: {error}")
+
+    return list(dict.fromkeys(errors))
+
+def check_imports(directory: str = "src"):
+    """Check all Python files for syntax and import errors"""
     root = Path(directory)
-    
-    for path in root.rglob("*.py"):
-        module_path = str(path.relative_to(root.parent)).replace("/", ".")[:-3]
-        try:
-            importlib.import_module(module_path)
-        except ImportError as e:
-            errors.append(f"{module_path}: {str(e)}")
-            
+    files = [
+        (str(path), str(path.relative_to(root.parent)).replace("/", ".")[:-3].removesuffix(".__init__"))
+        for path in root.rglob("*.py")
+    ]
+
+    errors = []
+    with ProcessPoolExecutor() as executor:
+        for file_errors in executor.map(_check_file, files):
+            errors.extend(file_errors)
+
     return errors
 
 if __name__ == "__main__":
@@ -24,4 +90,4 @@ if __name__ == "__main__":
         for error in errors:
             print(f"  - {error}")
         sys.exit(1)
-    print("No import errors found") 
\ No newline at end of file
+    print("No import errors found")
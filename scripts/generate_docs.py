@@ -1,23 +1,28 @@
 from pathlib import Path
-import json
-from fastapi.openapi.utils import get_openapi
+import hashlib
+import orjson
 from src.main import app
 
 def generate_openapi_spec():
-    """Generate OpenAPI specification"""
-    openapi_schema = get_openapi(
-        title=app.title,
-        version=app.version,
-        description=app.description,
-        routes=app.routes,
-    )
-    
-    # Write OpenAPI spec to file
+    """Generate OpenAPI specification, rewriting it only when it changed"""
+    # app.openapi() memoizes the schema on app.openapi_schema
+    openapi_schema = app.openapi()
+    payload = orjson.dumps(openapi_schema, option=orjson.OPT_INDENT_2)
+    digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+
     docs_path = Path("docs")
     docs_path.mkdir(exist_ok=True)
-    
-    with open(docs_path / "openapi.json", "w") as f:
-        json.dump(openapi_schema, f, indent=2)
+    spec_path = docs_path / "openapi.json"
+    digest_path = docs_path / "openapi.json.sha"
+
+    if spec_path.exists() and digest_path.exists() and digest_path.read_text().strip() == digest:
+        print("OpenAPI spec unchanged")
+        return
+
+    # Write OpenAPI spec to file
+    spec_path.write_bytes(payload)
+    digest_path.write_text(digest)
+    print(f"OpenAPI spec written to {spec_path}")
 
 if __name__ == "__main__":
-    generate_openapi_spec() 
\ No newline at end of file
+    generate_openapi_spec()
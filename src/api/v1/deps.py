@@ -0,0 +1,56 @@
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+
+from src.schemas.trading import TradeSignal
+from src.services.risk_manager import RiskManager
+from src.services.strategy import StrategyGenerator
+from src.services.trade_executor import TradeExecutor
+from src.utils.redis_client import RedisClient
+
+# Services are created once per worker in the app lifespan (see src/main.py)
+
+def get_redis_client(request: Request) -> RedisClient:
+    return request.app.state.redis_client
+
+def get_risk_manager(request: Request) -> RiskManager:
+    return request.app.state.risk_manager
+
+def get_strategy_generator(request: Request) -> StrategyGenerator:
+    return request.app.state.strategy_generator
+
+def get_trade_executor(request: Request) -> TradeExecutor:
+    return request.app.state.trade_executor
+
+_trade_signal_adapter = TypeAdapter(TradeSignal)
+
+def _inline_defs(schema: dict) -> dict:
+    """Resolve local $defs refs so the schema stands alone inside an OpenAPI document"""
+    defs = schema.pop("$defs", {})
+
+    def resolve(node):
+        if isinstance(node, dict):
+            ref = node.get("$ref", "")
+            if ref.startswith("#/$defs/"):
+                return resolve(defs[ref[len("#/$defs/"):]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(item) for item in node]
+        return node
+
+    return resolve(schema)
+
+# parse_trade_signal reads the body itself, so routes using it document the body via openapi_extra
+TRADE_SIGNAL_BODY = {
+    "requestBody": {
+        "content": {"application/json": {"schema": _inline_defs(_trade_signal_adapter.json_schema())}},
+        "required": True,
+    }
+}
+
+async def parse_trade_signal(request: Request) -> TradeSignal:
+    """Validate the raw request body as a TradeSignal in one pass"""
+    try:
+        return _trade_signal_adapter.validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
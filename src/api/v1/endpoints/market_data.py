@@ -1,44 +1,103 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Dict, List
 from datetime import datetime, timedelta
+import orjson
 
-from src.db.session import get_db
-from src.schemas.market_data import MarketDataResponse, OrderBookResponse
-from src.services.data_ingestion import DataIngestionService
+from src.api.v1.deps import get_redis_client
+from src.core.config import get_settings
+from src.db.session import AsyncSessionLocal, get_db
+from src.db.models.market_data import MarketData
+from src.schemas.market_data import MarketDataResponse, MarketDataSnapshot, OrderBookResponse
 from src.utils.redis_client import RedisClient
 
+settings = get_settings()
+
 router = APIRouter()
-redis_client = RedisClient()
 
-@router.get("/latest/{exchange}/{trading_pair}", response_model=MarketDataResponse)
+@router.get("/latest/{exchange}", response_model=Dict[str, MarketDataSnapshot])
+async def get_latest_market_data_batch(
+    exchange: str,
+    pairs: str,
+    db: AsyncSession = Depends(get_db),
+    redis_client: RedisClient = Depends(get_redis_client)
+):
+    """Get latest market data for several comma-separated trading pairs"""
+    trading_pairs = [pair.strip() for pair in pairs.split(",") if pair.strip()]
+    cached = await redis_client.mget(
+        [f"market_data:{exchange}:{pair}" for pair in trading_pairs]
+    )
+    
+    latest = {
+        pair: data for pair, data in zip(trading_pairs, cached) if data
+    }
+    
+    # Fill cache misses from the database with one DISTINCT ON query
+    missing = [pair for pair in trading_pairs if pair not in latest]
+    if missing:
+        stmt = (
+            select(MarketData)
+            .where(
+                MarketData.exchange == exchange,
+                MarketData.symbol.in_(missing)
+            )
+            .order_by(MarketData.symbol, MarketData.timestamp.desc())
+            .distinct(MarketData.symbol)
+        )
+        result = await db.execute(stmt)
+        backfill = []
+        for market_data in result.scalars():
+            snapshot = MarketDataSnapshot.model_validate(market_data).model_dump(mode="json")
+            latest[market_data.symbol] = snapshot
+            backfill.append((
+                f"market_data:{exchange}:{market_data.symbol}",
+                snapshot,
+                settings.MARKET_DATA_CACHE_TTL
+            ))
+        # Repopulate every missed key in one pipelined round-trip
+        await redis_client.set_many(backfill)
+    
+    return latest
+
+@router.get("/latest/{exchange}/{trading_pair}", response_model=MarketDataSnapshot)
 async def get_latest_market_data(
     exchange: str,
     trading_pair: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    redis_client: RedisClient = Depends(get_redis_client)
 ):
     """Get latest market data for a specific trading pair"""
-    # Try Redis first
-    key = f"market_data:{exchange}:{trading_pair}"
-    cached_data = await redis_client.get_data(key)
-    if cached_data:
-        return cached_data
-
-    # Fallback to database
-    query = (
-        db.query(MarketData)
-        .filter(
-            MarketData.exchange == exchange,
-            MarketData.symbol == trading_pair
+    async def load_from_db():
+        stmt = (
+            select(MarketData)
+            .where(
+                MarketData.exchange == exchange,
+                MarketData.symbol == trading_pair
+            )
+            .order_by(MarketData.timestamp.desc())
+            .limit(1)
         )
-        .order_by(MarketData.timestamp.desc())
-        .first()
+        result = await db.execute(stmt)
+        market_data = result.scalar_one_or_none()
+        if not market_data:
+            return None
+        # Same shape DataIngestionService.cache_data writes under this key
+        return MarketDataSnapshot.model_validate(market_data).model_dump(mode="json")
+
+    # Try Redis first, letting a single request repopulate on a miss
+    key = f"market_data:{exchange}:{trading_pair}"
+    market_data = await redis_client.get_or_set(
+        key,
+        load_from_db,
+        expire=settings.MARKET_DATA_CACHE_TTL
     )
     
-    if not query:
+    if not market_data:
         raise HTTPException(status_code=404, detail="Market data not found")
     
-    return query
+    return market_data
 
 @router.get("/historical/{exchange}/{trading_pair}", response_model=List[MarketDataResponse])
 async def get_historical_market_data(
@@ -46,20 +105,34 @@ async def get_historical_market_data(
     trading_pair: str,
     start_time: datetime,
     end_time: datetime = None,
+    stream: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
     """Get historical market data for a specific trading pair"""
     if not end_time:
         end_time = datetime.utcnow()
 
-    query = (
-        db.query(MarketData)
-        .filter(
+    stmt = (
+        select(MarketData)
+        .where(
             MarketData.exchange == exchange,
             MarketData.symbol == trading_pair,
             MarketData.timestamp.between(start_time, end_time)
         )
         .order_by(MarketData.timestamp.asc())
     )
+
+    if stream:
+        # Stream NDJSON in chunks so long ranges never sit in memory all at once
+        async def iter_rows():
+            # Own session: the request-scoped one may be closed before the body is sent
+            async with AsyncSessionLocal() as session:
+                rows = await session.stream_scalars(stmt.execution_options(yield_per=1000))
+                async for row in rows:
+                    yield orjson.dumps(MarketDataResponse.model_validate(row).model_dump()) + b"\n"
+
+        return StreamingResponse(iter_rows(), media_type="application/x-ndjson")
+
+    result = await db.execute(stmt)
     
-    return await query.all() 
\ No newline at end of file
+    return result.scalars().all() 
\ No newline at end of file
@@ -1,49 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict
 
+from src.api.v1.deps import get_risk_manager, parse_trade_signal, TRADE_SIGNAL_BODY
 from src.db.session import get_db
 from src.services.risk_manager import RiskManager
 from src.schemas.trading import TradeSignal
 
 router = APIRouter()
-risk_manager = RiskManager()
 
-@router.post("/validate-trade", response_model=Dict[str, bool])
+@router.post("/validate-trade", response_model=Dict[str, bool], openapi_extra=TRADE_SIGNAL_BODY)
 async def validate_trade(
-    trade_signal: TradeSignal,
-    db: AsyncSession = Depends(get_db)
+    trade_signal: TradeSignal = Depends(parse_trade_signal),
+    db: AsyncSession = Depends(get_db),
+    risk_manager: RiskManager = Depends(get_risk_manager)
 ):
     """Validate trade against risk parameters"""
-    try:
-        is_valid = await risk_manager.validate_trade(trade_signal.dict())
-        return {"is_valid": is_valid}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    is_valid = await risk_manager.validate_trade(trade_signal)
+    return {"is_valid": is_valid}
 
 @router.get("/metrics", response_model=Dict)
 async def get_risk_metrics(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    risk_manager: RiskManager = Depends(get_risk_manager)
 ):
     """Get current risk metrics"""
-    try:
-        metrics = await risk_manager.check_risk_limits()
-        return metrics
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await risk_manager.check_risk_limits()
 
-@router.post("/calculate-position-size", response_model=Dict)
+@router.post("/calculate-position-size", response_model=Dict, openapi_extra=TRADE_SIGNAL_BODY)
 async def calculate_position_size(
-    trade_signal: TradeSignal,
     account_balance: float,
-    db: AsyncSession = Depends(get_db)
+    trade_signal: TradeSignal = Depends(parse_trade_signal),
+    db: AsyncSession = Depends(get_db),
+    risk_manager: RiskManager = Depends(get_risk_manager)
 ):
     """Calculate appropriate position size"""
-    try:
-        size = await risk_manager.calculate_position_size(
-            trade_signal.dict(),
-            account_balance
-        )
-        return {"position_size": size}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+    size = await risk_manager.calculate_position_size(
+        trade_signal,
+        account_balance
+    )
+    return {"position_size": size} 
\ No newline at end of file
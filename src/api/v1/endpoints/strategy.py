@@ -1,40 +1,42 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict
 
+from src.api.v1.deps import get_strategy_generator
 from src.db.session import get_db
+from src.db.models.trading import PerformanceMetrics
 from src.services.strategy import StrategyGenerator
-from src.schemas.trading import TradeResponse
+from src.schemas.trading import TradeResponse, PerformanceMetricsResponse
 
 router = APIRouter()
-strategy_generator = StrategyGenerator()
 
 @router.post("/generate", response_model=Dict)
 async def generate_strategy(
     market_data: Dict,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    strategy_generator: StrategyGenerator = Depends(get_strategy_generator)
 ):
     """Generate trading strategy based on market data"""
-    try:
-        if not strategy_generator.assistant_id:
-            await strategy_generator.initialize()
-            
-        strategy = await strategy_generator.generate_strategy(market_data)
-        return strategy
+    if not strategy_generator.assistant_id:
+        await strategy_generator.initialize()
         
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await strategy_generator.generate_strategy(market_data)
 
-@router.get("/performance/{strategy_id}", response_model=Dict)
+@router.get("/performance/{strategy_id}", response_model=PerformanceMetricsResponse)
 async def get_strategy_performance(
     strategy_id: str,
     db: AsyncSession = Depends(get_db)
 ):
     """Get performance metrics for a strategy"""
-    metrics = await db.query(PerformanceMetrics)\
-        .filter(PerformanceMetrics.strategy_id == strategy_id)\
-        .order_by(PerformanceMetrics.timestamp.desc())\
-        .first()
+    stmt = (
+        select(PerformanceMetrics)
+        .where(PerformanceMetrics.strategy_id == strategy_id)
+        .order_by(PerformanceMetrics.timestamp.desc())
+        .limit(1)
+    )
+    result = await db.execute(stmt)
+    metrics = result.scalar_one_or_none()
         
     if not metrics:
         raise HTTPException(status_code=404, detail="Strategy not found")
@@ -1,52 +1,71 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, List
 
+from src.api.v1.deps import get_trade_executor, parse_trade_signal, TRADE_SIGNAL_BODY
+from src.core.exceptions import ExecutionError
 from src.db.session import get_db
+from src.db.models.trading import Trade
 from src.services.trade_executor import TradeExecutor
 from src.schemas.trading import TradeSignal, TradeResponse
 
 router = APIRouter()
-trade_executor = TradeExecutor()
 
-@router.post("/execute", response_model=Dict)
+@router.post("/execute", response_model=Dict, openapi_extra=TRADE_SIGNAL_BODY)
 async def execute_trade(
-    trade_signal: TradeSignal,
-    db: AsyncSession = Depends(get_db)
+    trade_signal: TradeSignal = Depends(parse_trade_signal),
+    db: AsyncSession = Depends(get_db),
+    trade_executor: TradeExecutor = Depends(get_trade_executor)
 ):
     """Execute a trade"""
-    try:
-        result = await trade_executor.execute_trade(trade_signal.dict())
-        if result:
-            return result
-        raise HTTPException(status_code=400, detail="Trade execution failed")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await trade_executor.execute_trade(trade_signal)
+    if not result:
+        raise ExecutionError("Trade execution failed")
+    return result
+
+@router.post("/queue", response_model=Dict, status_code=202, openapi_extra=TRADE_SIGNAL_BODY)
+async def queue_trade(
+    trade_signal: TradeSignal = Depends(parse_trade_signal),
+    trade_executor: TradeExecutor = Depends(get_trade_executor)
+):
+    """Queue a trade for asynchronous submission and return its ticket"""
+    ticket = await trade_executor.queue_trade(trade_signal)
+    if not ticket:
+        raise ExecutionError("Trade rejected")
+    return ticket.to_dict()
+
+@router.get("/tickets/{ticket_id}", response_model=Dict)
+async def get_ticket(
+    ticket_id: str,
+    trade_executor: TradeExecutor = Depends(get_trade_executor)
+):
+    """Get the submission status of a queued trade"""
+    ticket = trade_executor.tickets.get(ticket_id)
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    return ticket.to_dict()
 
 @router.get("/active", response_model=List[TradeResponse])
 async def get_active_trades(
     db: AsyncSession = Depends(get_db)
 ):
     """Get all active trades"""
-    try:
-        trades = await db.query(Trade).filter(
-            Trade.exit_time.is_(None),
-            Trade.status == "FILLED"
-        ).all()
-        return trades
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    stmt = select(Trade).where(
+        Trade.exit_time.is_(None),
+        Trade.status == "FILLED"
+    )
+    result = await db.execute(stmt)
+    return result.scalars().all()
 
 @router.post("/close/{trade_id}", response_model=Dict)
 async def close_trade(
     trade_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    trade_executor: TradeExecutor = Depends(get_trade_executor)
 ):
     """Close a specific trade"""
-    try:
-        result = await trade_executor.close_position(trade_id)
-        if result:
-            return result
-        raise HTTPException(status_code=400, detail="Failed to close trade")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+    result = await trade_executor.close_position(trade_id)
+    if not result:
+        raise ExecutionError("Failed to close trade")
+    return result 
\ No newline at end of file
@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from typing import List, Dict, Optional
-from functools import lru_cache
+from functools import cached_property, lru_cache
 
 class Settings(BaseSettings):
     # API Settings
@@ -28,6 +28,9 @@ class Settings(BaseSettings):
     BINANCE_API_SECRET: Optional[str] = None
     BINANCE_TESTNET: bool = False
     BINANCE_TESTNET_BASE_URL: Optional[str] = None
+    # Assets whose free balance sizes new positions
+    BINANCE_BALANCE_ASSET: str = "USDT"
+    DERIBIT_BALANCE_CURRENCY: str = "BTC"
     
     # OpenAI Settings
     OPENAI_API_KEY: str
@@ -40,7 +43,8 @@ class Settings(BaseSettings):
     MAX_DRAWDOWN: float = 0.05
     RISK_PER_TRADE: float = 0.01
 
-    @property
+    # Built once per Settings instance; get_settings() keeps a single instance per process
+    @cached_property
     def RISK_LIMITS(self) -> Dict:
         return {
             "max_position_size": self.MAX_POSITION_SIZE,
@@ -55,6 +59,8 @@ class Settings(BaseSettings):
     CLICKHOUSE_DB: str = "trading_analytics"
     CLICKHOUSE_USER: str = "default"
     CLICKHOUSE_PASSWORD: str = ""
+    # Tables store_analytics may write to; anything else is rejected
+    CLICKHOUSE_TABLES: List[str] = ["trade_analytics", "strategy_analytics", "market_analytics"]
     
     # Telemetry Settings
     SENTRY_DSN: Optional[str] = "https://dummy@dummy.ingest.sentry.io/123456"
@@ -70,18 +76,42 @@ class Settings(BaseSettings):
     ENABLE_PAPER_TRADING: bool = False
     ENABLE_MOCK_RESPONSES: bool = False
     ENABLE_DEBUG_MODE: bool = False
+    # Exchange websockets and order polling started by the lifespan; off for the test suite
+    ENABLE_EXCHANGE_STREAMS: bool = True
     
     # Performance Settings
     WEBSOCKET_PING_INTERVAL: int = 30
     WEBSOCKET_TIMEOUT: int = 60
+    WEBSOCKET_MAX_CONCURRENT_CONNECTS: int = 2
+    WEBSOCKET_RECONNECT_MAX_DELAY: int = 60
     HTTP_TIMEOUT: int = 30
     MAX_CONNECTIONS: int = 100
+    # Per exchange host; HTTP/2 multiplexes concurrent requests over these
+    EXCHANGE_MAX_CONNECTIONS: int = 20
+    ORDER_STATUS_CONCURRENCY: int = 20
+    ORDER_SUBMIT_CONCURRENCY: int = 10
+    # Exchanges without a connected user-data stream are polled every ORDER_POLL_INTERVAL;
+    # streamed ones are only reconciled every ORDER_RECONCILE_INTERVAL
+    ORDER_POLL_INTERVAL: float = 1.0
+    ORDER_RECONCILE_INTERVAL: int = 30
+    ACCOUNT_BALANCE_CACHE_TTL: float = 2.0
     POOL_SIZE: int = 20
+    MARKET_DATA_BATCH_SIZE: int = 500
+    MARKET_DATA_FLUSH_INTERVAL: float = 0.2
+    TRADE_WRITE_BATCH_SIZE: int = 100
+    TRADE_WRITE_FLUSH_INTERVAL: float = 0.05
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_TIMEOUT: int = 10
+    DB_COMMAND_TIMEOUT: int = 30
+    # Set to 0 when running behind PgBouncer in transaction pooling mode
+    DB_STATEMENT_CACHE_SIZE: int = 2048
     
     # Cache Settings
     CACHE_TTL: int = 15
     MARKET_DATA_CACHE_TTL: int = 15
     STRATEGY_CACHE_TTL: int = 300
+    RISK_METRICS_CACHE_TTL: int = 5
     
     # Logging Settings
     LOG_LEVEL: str = "DEBUG"
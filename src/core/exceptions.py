@@ -0,0 +1,19 @@
+class ServiceError(Exception):
+    """Base class for errors the API maps to a client-facing response"""
+    status_code: int = 500
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+class RiskError(ServiceError):
+    """Trade or sizing request could not be evaluated against risk limits"""
+    status_code = 400
+
+class ExecutionError(ServiceError):
+    """Order could not be placed, closed or tracked on the exchange"""
+    status_code = 400
+
+class StrategyError(ServiceError):
+    """Strategy could not be generated"""
+    status_code = 500
@@ -1,7 +1,9 @@
 from fastapi import Request
 from prometheus_client import Counter, Histogram
 import time
-from typing import Callable
+from typing import Callable, Dict, Optional
+from loguru import logger
+from starlette.routing import Match
 from starlette.types import ASGIApp
 
 # Metrics
@@ -25,21 +27,24 @@ class PrometheusMiddleware:
         if scope["type"] != "http":
             return await self.app(scope, receive, send)
 
-        path = scope["path"]
         method = scope["method"]
         
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         async def wrapped_send(message):
             if message["type"] == "http.response.start":
                 status_code = message["status"]
+                # Label by route template once routing has resolved it, so path
+                # parameters don't create a new time series per URL
+                route = scope.get("route")
+                path = route.path if route else scope["path"]
                 http_requests_total.labels(
                     method=method,
                     endpoint=path,
                     status=status_code
                 ).inc()
                 
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
                 http_request_duration_seconds.labels(
                     method=method,
                     endpoint=path
@@ -47,4 +52,84 @@ class PrometheusMiddleware:
             
             await send(message)
 
-        await self.app(scope, receive, wrapped_send) 
\ No newline at end of file
+        await self.app(scope, receive, wrapped_send)
+
+class ResponseCacheMiddleware:
+    """Serve repeated GETs on cacheable endpoints from Redis without running the handler"""
+
+    def __init__(self, app: ASGIApp, policies: Dict[str, int]):
+        self.app = app
+        # Path prefix -> TTL in seconds
+        self.policies = policies
+
+    def _ttl_for(self, path: str) -> Optional[int]:
+        for prefix, ttl in self.policies.items():
+            if path.startswith(prefix):
+                return ttl
+        return None
+
+    @staticmethod
+    def _match_route(scope):
+        """Resolve the route a hit would have reached, since hits never pass through routing"""
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return await self.app(scope, receive, send)
+
+        ttl = self._ttl_for(scope["path"])
+        redis_client = getattr(scope["app"].state, "redis_client", None)
+        if ttl is None or redis_client is None or redis_client.redis is None:
+            return await self.app(scope, receive, send)
+
+        key = f"http_cache:{scope['path']}?{scope['query_string'].decode()}"
+        try:
+            cached = await redis_client.get_data(key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            cached = None
+
+        if cached:
+            # Lets PrometheusMiddleware label the hit by route template rather than raw path
+            scope["route"] = self._match_route(scope)
+            await send({
+                "type": "http.response.start",
+                "status": cached["status"],
+                "headers": cached["headers"]
+            })
+            await send({"type": "http.response.body", "body": cached["body"]})
+            return
+
+        cache_control = (b"cache-control", f"public, max-age={ttl}".encode())
+        response = {}
+        body_parts = []
+
+        async def wrapped_send(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), cache_control]
+                response["status"] = message["status"]
+                # Per-origin CORS headers must not be replayed to other origins
+                response["headers"] = [
+                    (name, value) for name, value in message["headers"]
+                    if not name.lower().startswith(b"access-control-")
+                ]
+
+            elif message["type"] == "http.response.body" and response.get("status") == 200:
+                body_parts.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    try:
+                        await redis_client.set_data(
+                            key,
+                            {**response, "body": b"".join(body_parts)},
+                            expire=ttl
+                        )
+                    except Exception as e:
+                        logger.warning(f"Response cache write failed: {e}")
+
+            await send(message)
+
+        await self.app(scope, receive, wrapped_send)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Index
 from sqlalchemy.sql import func
 
 from src.db.base import Base
@@ -6,10 +6,11 @@ from src.db.base import Base
 class MarketData(Base):
     __tablename__ = "market_data"
     
-    id = Column(Integer, primary_key=True)
+    # TimescaleDB hypertable partitioned on timestamp, so it is part of the primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
     symbol = Column(String, nullable=False)
     exchange = Column(String, nullable=False)
-    timestamp = Column(DateTime(timezone=True), nullable=False)
+    timestamp = Column(DateTime(timezone=True), primary_key=True, nullable=False)
     open = Column(Float, nullable=False)
     high = Column(Float, nullable=False)
     low = Column(Float, nullable=False)
@@ -17,6 +18,19 @@ class MarketData(Base):
     volume = Column(Float, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Latest-price lookup: (exchange, symbol) predicate ordered by newest first
+        Index("ix_md_exch_sym_ts", exchange, symbol, timestamp.desc()),
+        # Historical range scans served index-only
+        Index(
+            "ix_md_ohlcv_cover",
+            exchange,
+            symbol,
+            timestamp,
+            postgresql_include=["open", "high", "low", "close", "volume"]
+        ),
+    )
+
 class OrderBook(Base):
     __tablename__ = "order_book"
     
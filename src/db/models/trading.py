@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, JSON, Index
 from sqlalchemy.sql import func
 import enum
 from src.db.base import Base
@@ -13,10 +13,20 @@ class TradeDirection(enum.Enum):
     LONG = "long"
     SHORT = "short"
 
+# PnL sign per direction; raw names are included for rows built from plain dicts
+DIRECTION_SIGN = {
+    TradeDirection.LONG: 1.0,
+    TradeDirection.SHORT: -1.0,
+    "LONG": 1.0,
+    "SHORT": -1.0,
+}
+
 class Trade(Base):
     __tablename__ = "trades"
     
     id = Column(Integer, primary_key=True)
+    # Exchange-assigned id of the entry order; fills and status updates arrive keyed by it
+    order_id = Column(String, index=True)
     symbol = Column(String, nullable=False)
     direction = Column(Enum(TradeDirection), nullable=False)
     entry_price = Column(Float, nullable=False)
@@ -30,6 +40,16 @@ class Trade(Base):
     trade_data = Column(JSON)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Backs the active trades lookup (open FILLED trades)
+        Index("ix_trade_active", status, exit_time),
+    )
+
+    @property
+    def sign(self) -> float:
+        """+1.0 for longs, -1.0 for shorts"""
+        return DIRECTION_SIGN[self.direction]
+
 class PerformanceMetrics(Base):
     __tablename__ = "performance_metrics"
     
@@ -1,39 +1,154 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager
 import asyncio
+import os
+from typing import Dict
+import orjson
+import uvicorn
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
 from loguru import logger
 from prometheus_client import make_asgi_app
 
 from src.core.config import get_settings
+from src.core.exceptions import ServiceError
 from src.api.v1.router import api_router
 from src.services.data_ingestion import DataIngestionService
 from src.services.strategy import StrategyGenerator
 from src.services.risk_manager import RiskManager
-from src.services.trade_executor import TradeExecutor
-from src.core.middleware import PrometheusMiddleware
+from src.services.trade_executor import TradeExecutor, create_exchange_clients
+from src.utils.redis_client import RedisClient
+from src.core.middleware import PrometheusMiddleware, ResponseCacheMiddleware
 from src.services.monitoring import MonitoringService
 from src.core.telemetry import setup_telemetry
 
 settings = get_settings()
 
-# Initialize services
-data_service = DataIngestionService()
-strategy_generator = StrategyGenerator()
-risk_manager = RiskManager()
-trade_executor = TradeExecutor()
+# Any loop created after import (tests, scripts, uvicorn --loop auto) is a uvloop
+if uvloop is not None:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 # Initialize monitoring
 monitoring = MonitoringService()
 
+HEALTH_REFRESH_INTERVAL = 2
+
+def _collect_health(state) -> Dict:
+    """Snapshot the state of each service for the health endpoint"""
+    return {
+        "status": "healthy",
+        "services": {
+            "data_ingestion": state.data_service.running,
+            "strategy": state.strategy_generator.assistant_id is not None,
+            "risk_manager": state.risk_manager.redis_client.redis is not None,
+            "trade_executor": not any(
+                client.is_closed for client in state.trade_executor.http_clients.values()
+            )
+        }
+    }
+
+async def _refresh_health_loop(app: FastAPI, interval: float):
+    """Keep app.state.health current so health probes never touch the services"""
+    while True:
+        try:
+            app.state.health = _collect_health(app.state)
+        except Exception as e:
+            logger.error(f"Error refreshing health state: {e}")
+        await asyncio.sleep(interval)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create and initialize services on startup, clean them up on shutdown"""
+    try:
+        logger.info("Initializing services...")
+        
+        # Services live on app.state so each worker builds its own on startup
+        app.state.http = create_exchange_clients()
+        app.state.redis_client = RedisClient()
+        # One Redis client and risk manager shared by every service and the API
+        app.state.data_service = DataIngestionService(redis_client=app.state.redis_client)
+        app.state.strategy_generator = StrategyGenerator(redis_client=app.state.redis_client)
+        app.state.risk_manager = RiskManager(redis_client=app.state.redis_client)
+        app.state.trade_executor = TradeExecutor(
+            http_clients=app.state.http,
+            redis_client=app.state.redis_client,
+            risk_manager=app.state.risk_manager
+        )
+        
+        # Initialize all services
+        await app.state.redis_client.connect()
+        await app.state.data_service.initialize()
+        await app.state.strategy_generator.initialize()
+        await app.state.risk_manager.initialize()
+        await app.state.trade_executor.initialize()
+        
+        app.state.health = _collect_health(app.state)
+        
+        # Start background tasks
+        background_tasks = [
+            asyncio.create_task(_refresh_health_loop(app, HEALTH_REFRESH_INTERVAL))
+        ]
+        if settings.ENABLE_EXCHANGE_STREAMS:
+            background_tasks += [
+                asyncio.create_task(app.state.data_service.start_data_streams()),
+                asyncio.create_task(app.state.trade_executor.manage_open_positions())
+            ]
+        
+        logger.info("All services initialized successfully")
+        
+    except Exception as e:
+        logger.error(f"Error during startup: {e}")
+        raise
+
+    yield
+
+    try:
+        logger.info("Shutting down services...")
+        
+        for task in background_tasks:
+            task.cancel()
+        
+        # Stop all services
+        await app.state.data_service.stop()
+        await app.state.strategy_generator.stop()
+        await app.state.risk_manager.stop()
+        await app.state.trade_executor.stop()
+        await app.state.redis_client.disconnect()
+        await asyncio.gather(*(client.aclose() for client in app.state.http.values()))
+        
+        logger.info("All services shut down successfully")
+        
+    except Exception as e:
+        logger.error(f"Error during shutdown: {e}")
+        raise
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version="1.0.0",
-    description="AI Trading System API"
+    description="AI Trading System API",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Setup telemetry before creating the app
 setup_telemetry(app)
 
+# Cache hot GET responses in Redis. Added before CORS so it runs inside it: the echoed
+# Access-Control-Allow-Origin is set per request and never stored with the cached response
+app.add_middleware(
+    ResponseCacheMiddleware,
+    policies={
+        # Prefix match: covers /latest/{exchange}/{trading_pair} and the batch
+        # /latest/{exchange}?pairs=..., whose query string is part of the cache key
+        f"{settings.API_V1_STR}/market-data/latest": settings.MARKET_DATA_CACHE_TTL,
+        f"{settings.API_V1_STR}/risk/metrics": settings.RISK_METRICS_CACHE_TTL
+    }
+)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -53,55 +168,32 @@ app.mount("/metrics", metrics_app)
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup"""
-    try:
-        logger.info("Initializing services...")
-        
-        # Initialize all services
-        await data_service.initialize()
-        await strategy_generator.initialize()
-        await risk_manager.initialize()
-        await trade_executor.initialize()
-        
-        # Start background tasks
-        asyncio.create_task(data_service.start_data_streams())
-        asyncio.create_task(trade_executor.manage_open_positions())
-        
-        logger.info("All services initialized successfully")
-        
-    except Exception as e:
-        logger.error(f"Error during startup: {e}")
-        raise
+_INTERNAL_ERROR_BODY = orjson.dumps({"detail": "Internal server error"})
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    try:
-        logger.info("Shutting down services...")
-        
-        # Stop all services
-        await data_service.stop()
-        await strategy_generator.stop()
-        await risk_manager.stop()
-        await trade_executor.stop()
-        
-        logger.info("All services shut down successfully")
-        
-    except Exception as e:
-        logger.error(f"Error during shutdown: {e}")
-        raise
+@app.exception_handler(ServiceError)
+async def service_error_handler(request: Request, exc: ServiceError):
+    return ORJSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+
+@app.exception_handler(Exception)
+async def unhandled_error_handler(request: Request, exc: Exception):
+    logger.error(f"Unhandled error on {request.method} {request.url.path}: {exc!r}")
+    return Response(
+        content=_INTERNAL_ERROR_BODY,
+        status_code=500,
+        media_type="application/json"
+    )
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "services": {
-            "data_ingestion": data_service.running,
-            "strategy": strategy_generator.assistant_id is not None,
-            "risk_manager": risk_manager.redis_client.redis is not None,
-            "trade_executor": trade_executor.http_client is not None
-        }
-    } 
\ No newline at end of file
+    return request.app.state.health
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "src.main:app",
+        host="0.0.0.0",
+        port=settings.API_PORT,
+        workers=os.cpu_count(),
+        loop="uvloop",
+        http="httptools"
+    )
@@ -15,6 +15,12 @@ class MarketDataBase(BaseModel):
 class MarketDataCreate(MarketDataBase):
     pass
 
+class MarketDataSnapshot(MarketDataBase):
+    """Latest tick as cached by ingestion; rows read from the DB are trimmed to match"""
+
+    class Config:
+        from_attributes = True
+
 class MarketDataResponse(MarketDataBase):
     id: int
     created_at: datetime
@@ -16,6 +16,7 @@ class TradeDirection(str, Enum):
 class TradeSignal(BaseModel):
     """Incoming trade signal schema"""
     symbol: str
+    exchange: str = "binance"
     action: TradeDirection
     entry_price: float
     stop_loss: float
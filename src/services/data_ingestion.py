@@ -1,41 +1,128 @@
 import asyncio
-import websockets
-import json
-from datetime import datetime
-from typing import Dict, List, Optional
+import random
+import time
+import msgspec
+import orjson
+import numpy as np
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional
 from loguru import logger
+from websockets.asyncio.client import ClientConnection, connect as ws_connect
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.config import get_settings
 from src.utils.redis_client import RedisClient
-from src.db.session import get_db
-from src.db.models.market_data import MarketData, OrderBook
+from src.db.session import bulk_insert_market_data
+from src.db.models.market_data import OrderBook
 from src.schemas.market_data import MarketDataCreate, OrderBookCreate
 
 settings = get_settings()
 
+class BinanceKline(msgspec.Struct):
+    """The "k" object of a Binance kline event, as it arrives on the wire"""
+    t: int
+    o: float
+    h: float
+    l: float
+    c: float
+    v: float
+
+class BinanceTick(msgspec.Struct):
+    """Binance kline event; OHLCV sits in the nested "k" object"""
+    s: str
+    k: BinanceKline
+
+class BinanceStreamFrame(msgspec.Struct):
+    """Envelope Binance wraps around each event on a combined /stream connection"""
+    stream: str
+    data: BinanceTick
+
+class DeribitTick(msgspec.Struct):
+    """Deribit chart fields as they arrive on the wire"""
+    instrument_name: str
+    timestamp: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+class Kline(msgspec.Struct):
+    """Normalized OHLCV record; field names match the MarketData columns"""
+    symbol: str
+    exchange: str
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+_UTC = timezone.utc
+
+_rng = np.random.default_rng()
+
+# strict=False lets numeric fields sent as strings (Binance does this) decode as floats
+_binance_decoder = msgspec.json.Decoder(BinanceStreamFrame, strict=False)
+_deribit_decoder = msgspec.json.Decoder(DeribitTick, strict=False)
+
 class DataIngestionService:
-    def __init__(self):
-        self.redis_client = RedisClient()
-        self.connections: Dict[str, websockets.WebSocketClientProtocol] = {}
+    def __init__(self, redis_client: Optional[RedisClient] = None):
+        # Only a client built here is connected and closed by this service
+        self._owns_redis_client = redis_client is None
+        self.redis_client = redis_client or RedisClient()
+        self.connections: Dict[str, ClientConnection] = {}
         self.running = False
         self.exchange_urls = {
-            "binance": "wss://stream.binance.com:9443/ws",
+            # Combined stream endpoint: every pair is multiplexed over one socket
+            "binance": "wss://stream.binance.com:9443/stream",
             "deribit": "wss://www.deribit.com/ws/api/v2"
         }
         self.enabled_exchanges = []
+        # Exchange symbol (e.g. BTCUSDT) -> configured trading pair (e.g. BTC-USDT)
+        self._symbol_pairs = {
+            self._symbol_key(pair): pair for pair in settings.TRADING_PAIRS
+        }
+        # Normalized ticks waiting for the next batched insert
+        self._write_buffer: List[Dict] = []
+        self._buffer_full = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        # Set on stop; the flush loop finishes its current write, flushes once more and exits
+        self._flush_stop = asyncio.Event()
+        self._sub_payloads: Dict[str, str] = {}
+        # Caps simultaneous handshakes so a disruption doesn't trigger a reconnect storm
+        self._connect_limiter = asyncio.Semaphore(settings.WEBSOCKET_MAX_CONCURRENT_CONNECTS)
+        # Exchange -> specialized frame normalizer, so dispatch is one dict lookup
+        self._normalizers: Dict[str, Callable[[bytes | str], Optional[Kline]]] = {
+            "binance": self._make_binance_normalizer(),
+            # Mock frames use the Binance combined-stream shape
+            "mock": self._make_binance_normalizer("mock"),
+            "deribit": self._make_deribit_normalizer(),
+        }
 
     async def initialize(self):
         """Initialize the data ingestion service"""
         try:
             logger.info("Initializing data ingestion service...")
-            await self.redis_client.connect()
+            if self._owns_redis_client:
+                await self.redis_client.connect()
             self.running = False
             
             # Validate exchange configurations
             self.enabled_exchanges = self._validate_exchange_configs()
             if not self.enabled_exchanges:
                 logger.warning("No valid exchange configurations found - running in mock mode")
+
+            # Subscriptions are constant per exchange; serialize them once, not per reconnect.
+            # Kept as str so they go out as text frames
+            self._sub_payloads = {
+                exchange: orjson.dumps(
+                    self.get_subscription_message(exchange, settings.TRADING_PAIRS)
+                ).decode()
+                for exchange in self.enabled_exchanges
+            }
+            
+            self._flush_task = asyncio.create_task(self._flush_loop())
                 
             logger.info("Data ingestion service initialized successfully")
             
@@ -72,12 +159,10 @@ class DataIngestionService:
                 await self._start_mock_data_stream()
                 return
             
-            tasks = []
-            for exchange in self.enabled_exchanges:
-                for pair in settings.TRADING_PAIRS:
-                    tasks.append(self.connect_and_subscribe(exchange, pair))
-            
-            await asyncio.gather(*tasks)
+            # One connection per exchange carries every trading pair
+            async with asyncio.TaskGroup() as tg:
+                for exchange in self.enabled_exchanges:
+                    tg.create_task(self.connect_and_subscribe(exchange, settings.TRADING_PAIRS))
             
         except Exception as e:
             logger.error(f"Error starting data streams: {e}")
@@ -86,57 +171,100 @@ class DataIngestionService:
 
     async def _start_mock_data_stream(self):
         """Generate mock market data for testing"""
+        ticks = {pair: self._mock_ticks(pair) for pair in settings.TRADING_PAIRS}
         while self.running:
             try:
-                for pair in settings.TRADING_PAIRS:
-                    mock_data = self._generate_mock_data(pair)
-                    await self.process_market_data("mock", pair, json.dumps(mock_data))
+                for pair_ticks in ticks.values():
+                    mock_data = next(pair_ticks)
+                    await self.process_market_data("mock", orjson.dumps(mock_data))
                 await asyncio.sleep(1)  # Generate data every second
             except Exception as e:
                 logger.error(f"Error generating mock data: {e}")
                 await asyncio.sleep(5)
 
-    def _generate_mock_data(self, trading_pair: str) -> Dict:
-        """Generate mock market data"""
-        import random
+    def _mock_ticks(self, trading_pair: str) -> Iterator[Dict]:
+        """Endless mock ticks for a pair, drawn a batch at a time"""
+        while True:
+            yield from self._generate_mock_batch(trading_pair)
+
+    def _generate_mock_batch(self, trading_pair: str, n: int = 1024) -> Iterator[Dict]:
+        """Generate n mock Binance stream frames from one vectorized draw"""
         base_price = 50000 if "BTC" in trading_pair else 2000  # Base price for BTC or ETH
-        return {
-            "s": trading_pair,
-            "T": int(datetime.utcnow().timestamp() * 1000),
-            "o": base_price * (1 + random.uniform(-0.001, 0.001)),
-            "h": base_price * (1 + random.uniform(0, 0.002)),
-            "l": base_price * (1 - random.uniform(0, 0.002)),
-            "c": base_price * (1 + random.uniform(-0.001, 0.001)),
-            "v": random.uniform(1, 100)
-        }
+        opens = base_price * (1 + _rng.uniform(-0.001, 0.001, n))
+        highs = base_price * (1 + _rng.uniform(0, 0.002, n))
+        lows = base_price * (1 - _rng.uniform(0, 0.002, n))
+        closes = base_price * (1 + _rng.uniform(-0.001, 0.001, n))
+        volumes = _rng.uniform(1, 100, n)
+        symbol = self._symbol_key(trading_pair)
+        stream = f"{symbol.lower()}@kline_1m"
+        for o, h, low, c, v in zip(
+            opens.tolist(), highs.tolist(), lows.tolist(), closes.tolist(), volumes.tolist()
+        ):
+            yield {
+                "stream": stream,
+                "data": {
+                    "e": "kline",
+                    "s": symbol,
+                    "k": {
+                        "t": int(time.time() * 1000),
+                        "o": o,
+                        "h": h,
+                        "l": low,
+                        "c": c,
+                        "v": v
+                    }
+                }
+            }
 
-    async def connect_and_subscribe(self, exchange: str, trading_pair: str):
-        """Establish WebSocket connection and subscribe to market data"""
+    async def connect_and_subscribe(self, exchange: str, trading_pairs: List[str]):
+        """Establish one WebSocket connection per exchange and subscribe to all pairs on it"""
+        attempts = 0
         while self.running:
             try:
-                async with websockets.connect(self.exchange_urls[exchange]) as ws:
-                    self.connections[f"{exchange}_{trading_pair}"] = ws
+                async with self._connect_limiter:
+                    ws = await ws_connect(self.exchange_urls[exchange], max_size=2 ** 20)
+                try:
+                    self.connections[exchange] = ws
                     
                     # Subscribe to market data
-                    subscribe_msg = self.get_subscription_message(exchange, trading_pair)
-                    await ws.send(json.dumps(subscribe_msg))
+                    payload = self._sub_payloads.get(exchange)
+                    if payload is None:
+                        payload = orjson.dumps(
+                            self.get_subscription_message(exchange, trading_pairs)
+                        ).decode()
+                    await ws.send(payload)
+                    attempts = 0
                     
                     while self.running:
-                        message = await ws.recv()
-                        await self.process_market_data(exchange, trading_pair, message)
+                        # Raw frame bytes; msgspec decodes them without a UTF-8 str hop
+                        message = await ws.recv(decode=False)
+                        await self.process_market_data(exchange, message)
+                finally:
+                    await ws.close()
                         
             except Exception as e:
-                logger.error(f"Connection error for {exchange}_{trading_pair}: {e}")
-                await asyncio.sleep(5)  # Wait before reconnecting
+                # Exponential backoff with jitter so exchanges don't reconnect in lockstep
+                delay = min(settings.WEBSOCKET_RECONNECT_MAX_DELAY, 2 ** attempts) + random.random()
+                attempts += 1
+                logger.error(f"Connection error for {exchange}: {e}; reconnecting in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _symbol_key(symbol: str) -> str:
+        return symbol.replace("-", "").upper()
 
-    async def process_market_data(self, exchange: str, trading_pair: str, message: str):
+    async def process_market_data(self, exchange: str, message: bytes | str):
         """Process and store market data"""
         try:
-            data = json.loads(message)
-            
-            # Transform data based on exchange format
-            normalized_data = self.normalize_market_data(exchange, data)
-            if normalized_data:
+            # Decode straight from the frame into the exchange's typed record
+            kline = self.normalize_market_data(exchange, message)
+            if kline is not None:
+                normalized_data = msgspec.structs.asdict(kline)
+                # Frames for every pair share the connection; route by symbol
+                trading_pair = self._symbol_pairs.get(
+                    self._symbol_key(kline.symbol), kline.symbol
+                )
+                
                 # Cache in Redis
                 await self.cache_data(exchange, trading_pair, normalized_data)
                 
@@ -147,77 +275,110 @@ class DataIngestionService:
             logger.error(f"Error processing market data: {e}")
 
     async def cache_data(self, exchange: str, trading_pair: str, data: Dict):
-        """Cache market data in Redis"""
+        """Cache market data in Redis and publish it for real-time subscribers"""
         key = f"market_data:{exchange}:{trading_pair}"
-        await self.redis_client.set_data(key, data, expire=15)
-        
-        # Publish update for real-time subscribers
-        await self.redis_client.publish("market_updates", {
-            "exchange": exchange,
-            "trading_pair": trading_pair,
-            "data": data
-        })
+        await self.redis_client.pipe_set_publish(
+            key,
+            data,
+            "market_updates",
+            {
+                "exchange": exchange,
+                "trading_pair": trading_pair,
+                "data": data
+            },
+            expire=15
+        )
 
     async def store_market_data(self, data: Dict):
-        """Store market data in TimescaleDB"""
-        async for db in get_db():
-            market_data = MarketData(**data)
-            db.add(market_data)
-            await db.commit()
+        """Queue market data for the next batched write to TimescaleDB"""
+        self._write_buffer.append(data)
+        if len(self._write_buffer) >= settings.MARKET_DATA_BATCH_SIZE:
+            self._buffer_full.set()
 
-    def normalize_market_data(self, exchange: str, data: Dict) -> Optional[Dict]:
-        """Normalize market data based on exchange format"""
-        if exchange == "binance":
-            return self.normalize_binance_data(data)
-        elif exchange == "deribit":
-            return self.normalize_deribit_data(data)
-        return None
+    async def _flush_loop(self):
+        """Flush buffered market data when the buffer fills or the flush interval passes"""
+        while not self._flush_stop.is_set():
+            try:
+                await asyncio.wait_for(
+                    self._buffer_full.wait(),
+                    timeout=settings.MARKET_DATA_FLUSH_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._buffer_full.clear()
+            await self._flush_market_data()
+        await self._flush_market_data()
 
-    def normalize_binance_data(self, data: Dict) -> Optional[Dict]:
-        """Normalize Binance market data format"""
+    async def _flush_market_data(self):
+        """Write all buffered market data with one COPY"""
+        if not self._write_buffer:
+            return
+            
+        rows, self._write_buffer = self._write_buffer, []
         try:
-            return {
-                "symbol": data["s"],
-                "exchange": "binance",
-                "timestamp": datetime.fromtimestamp(data["T"] / 1000),
-                "open": float(data["o"]),
-                "high": float(data["h"]),
-                "low": float(data["l"]),
-                "close": float(data["c"]),
-                "volume": float(data["v"])
-            }
-        except KeyError:
-            return None
+            await bulk_insert_market_data(rows)
+        except Exception as e:
+            logger.error(f"Error storing {len(rows)} market data rows: {e}")
 
-    def normalize_deribit_data(self, data: Dict) -> Optional[Dict]:
-        """Normalize Deribit market data format"""
-        try:
-            return {
-                "symbol": data["instrument_name"],
-                "exchange": "deribit",
-                "timestamp": datetime.fromtimestamp(data["timestamp"] / 1000),
-                "open": float(data["open"]),
-                "high": float(data["high"]),
-                "low": float(data["low"]),
-                "close": float(data["close"]),
-                "volume": float(data["volume"])
-            }
-        except KeyError:
-            return None
+    def normalize_market_data(self, exchange: str, message: bytes | str) -> Optional[Kline]:
+        """Normalize market data based on exchange format"""
+        normalize = self._normalizers.get(exchange)
+        return normalize(message) if normalize else None
+
+    @staticmethod
+    def _make_binance_normalizer(exchange: str = "binance") -> Callable[[bytes | str], Optional[Kline]]:
+        """Build the Binance normalizer with its decoder and constants bound as locals"""
+        decode = _binance_decoder.decode
+        fromtimestamp = datetime.fromtimestamp
+        validation_error = msgspec.ValidationError
+
+        def normalize(message: bytes | str) -> Optional[Kline]:
+            try:
+                raw = decode(message).data
+            except validation_error:
+                return None
+            k = raw.k
+            return Kline(
+                raw.s, exchange, fromtimestamp(k.t * 0.001, _UTC),
+                k.o, k.h, k.l, k.c, k.v
+            )
+
+        return normalize
 
-    def get_subscription_message(self, exchange: str, trading_pair: str) -> Dict:
-        """Generate exchange-specific subscription messages"""
+    @staticmethod
+    def _make_deribit_normalizer() -> Callable[[bytes | str], Optional[Kline]]:
+        """Build the Deribit normalizer with its decoder and constants bound as locals"""
+        decode = _deribit_decoder.decode
+        fromtimestamp = datetime.fromtimestamp
+        validation_error = msgspec.ValidationError
+
+        def normalize(message: bytes | str) -> Optional[Kline]:
+            try:
+                raw = decode(message)
+            except validation_error:
+                return None
+            return Kline(
+                raw.instrument_name, "deribit", fromtimestamp(raw.timestamp * 0.001, _UTC),
+                raw.open, raw.high, raw.low, raw.close, raw.volume
+            )
+
+        return normalize
+
+    def get_subscription_message(self, exchange: str, trading_pairs: List[str]) -> Dict:
+        """Generate an exchange-specific subscription message covering all pairs"""
         if exchange == "binance":
             return {
                 "method": "SUBSCRIBE",
-                "params": [f"{trading_pair.lower()}@kline_1m"],
+                "params": [
+                    f"{self._symbol_key(pair).lower()}@kline_1m" for pair in trading_pairs
+                ],
                 "id": 1
             }
         elif exchange == "deribit":
             return {
                 "method": "public/subscribe",
                 "params": {
-                    "channels": [f"chart.trades.{trading_pair}.1"]
+                    "channels": [f"chart.trades.{pair}.1" for pair in trading_pairs]
                 }
             }
         return {}
@@ -227,4 +388,13 @@ class DataIngestionService:
         self.running = False
         for connection in self.connections.values():
             await connection.close()
-        await self.redis_client.disconnect() 
\ No newline at end of file
+        
+        if self._flush_task and not self._flush_task.done():
+            # Wake the loop rather than cancelling it, so an in-flight write completes
+            self._flush_stop.set()
+            self._buffer_full.set()
+            await self._flush_task
+        else:
+            await self._flush_market_data()
+        if self._owns_redis_client:
+            await self.redis_client.disconnect()
@@ -1,6 +1,5 @@
 from prometheus_client import Counter, Gauge, Histogram, Info
 from typing import Dict
-import time
 from loguru import logger
 
 class MonitoringService:
@@ -54,58 +53,61 @@ class MonitoringService:
         # System Info
         self.system_info = Info('trading_system', 'Trading system information')
 
+        # Bound label children, keyed by label-value tuple
+        self._trade_children: Dict[tuple, Counter] = {}
+        self._error_children: Dict[tuple, Counter] = {}
+        self._position_children: Dict[str, Gauge] = {}
+        self._balance_children: Dict[str, Gauge] = {}
+        self._strategy_children: Dict[tuple, Gauge] = {}
+        self._latency_children: Dict[str, Histogram] = {}
+        self._pnl_children: Dict[str, Histogram] = {}
+
+    @staticmethod
+    def _child(metric, children: Dict, key):
+        """Return the labelled child for key, binding it on first use"""
+        child = children.get(key)
+        if child is None:
+            labels = key if isinstance(key, tuple) else (key,)
+            child = children.setdefault(key, metric.labels(*labels))
+        return child
+
     def track_trade(self, exchange: str, symbol: str, direction: str):
         """Track executed trade"""
-        self.trade_counter.labels(
-            exchange=exchange,
-            symbol=symbol,
-            direction=direction
+        self._child(
+            self.trade_counter, self._trade_children, (exchange, symbol, direction)
         ).inc()
 
     def track_error(self, service: str, error_type: str):
         """Track service error"""
-        self.error_counter.labels(
-            service=service,
-            error_type=error_type
+        self._child(
+            self.error_counter, self._error_children, (service, error_type)
         ).inc()
 
     def update_positions(self, exchange: str, count: int):
         """Update active positions count"""
-        self.active_positions.labels(exchange=exchange).set(count)
+        self._child(self.active_positions, self._position_children, exchange).set(count)
 
     def update_balance(self, exchange: str, balance: float):
         """Update account balance"""
-        self.account_balance.labels(exchange=exchange).set(balance)
+        self._child(self.account_balance, self._balance_children, exchange).set(balance)
 
     def update_strategy_metrics(self, strategy_id: str, metrics: Dict[str, float]):
         """Update strategy performance metrics"""
         for metric, value in metrics.items():
-            self.strategy_performance.labels(
-                strategy_id=strategy_id,
-                metric=metric
+            self._child(
+                self.strategy_performance, self._strategy_children, (strategy_id, metric)
             ).set(value)
 
     def track_latency(self, operation: str):
         """Context manager for tracking operation latency"""
-        class LatencyTimer:
-            def __init__(self, histogram, operation):
-                self.histogram = histogram
-                self.operation = operation
-                self.start_time = None
-
-            def __enter__(self):
-                self.start_time = time.time()
-                return self
-
-            def __exit__(self, exc_type, exc_val, exc_tb):
-                latency = time.time() - self.start_time
-                self.histogram.labels(operation=self.operation).observe(latency)
-
-        return LatencyTimer(self.latency_histogram, operation)
+        # Histogram.time() is a perf_counter-based timer that observes on exit
+        return self._child(
+            self.latency_histogram, self._latency_children, operation
+        ).time()
 
     def record_pnl(self, strategy_id: str, pnl: float):
         """Record PnL for distribution tracking"""
-        self.pnl_histogram.labels(strategy_id=strategy_id).observe(pnl)
+        self._child(self.pnl_histogram, self._pnl_children, strategy_id).observe(pnl)
 
     def update_system_info(self, info: Dict[str, str]):
         """Update system information"""
@@ -1,37 +1,74 @@
-from typing import Dict, Optional, List
-from datetime import datetime, timedelta
+from typing import Dict, Optional, List, Tuple
+from datetime import datetime, timedelta, timezone
+import time
 from loguru import logger
 from sqlalchemy import func, select
-from decimal import Decimal
+import numpy as np
 
 from src.core.config import get_settings
+from src.core.exceptions import RiskError
 from src.db.session import get_db
 from src.db.models.trading import Trade, PerformanceMetrics
+from src.schemas.trading import TradeSignal
+from src.utils.jit import njit
 from src.utils.redis_client import RedisClient
 
 settings = get_settings()
 
+@njit(cache=True)
+def _position_size(
+    account_balance: float,
+    entry_price: float,
+    stop_loss: float,
+    risk_pct: float,
+    max_position_size: float
+) -> float:
+    """Size a position so hitting the stop loses risk_pct of the balance"""
+    risk_per_trade = account_balance * risk_pct
+    risk_per_unit = abs(entry_price - stop_loss) / entry_price
+    return min(risk_per_trade / risk_per_unit, max_position_size)
+
+@njit(cache=True)
+def _stop_loss_pct(entry_price: float, stop_loss: float) -> float:
+    return abs(entry_price - stop_loss) / entry_price
+
 class RiskManager:
-    def __init__(self):
-        self.redis_client = RedisClient()
+    def __init__(self, redis_client: Optional[RedisClient] = None):
+        # The lifespan passes its shared client; connect/disconnect stay with the owner
+        self._owns_redis_client = redis_client is None
+        self.redis_client = redis_client or RedisClient()
         self.risk_limits = settings.RISK_LIMITS
-        self.daily_trades: Dict[str, int] = {}
+        self.daily_trades: Dict[Tuple[str, str], int] = {}
         self.positions: Dict[str, Dict] = {}
+        # Sum of size * price over self.positions, kept current as positions change
+        self._current_exposure = 0.0
+        # Today's UTC date string, valid until the epoch second in _today_end
+        self._today_str = ""
+        self._today_end = 0.0
 
     async def initialize(self):
         """Initialize risk manager"""
-        await self.redis_client.connect()
+        if self._owns_redis_client:
+            await self.redis_client.connect()
         await self._load_active_positions()
 
-    async def validate_trade(self, trade_signal: Dict) -> bool:
+    def _today(self) -> str:
+        """UTC date string for now, recomputed only when the day rolls over"""
+        now = time.time()
+        if now >= self._today_end:
+            day = datetime.fromtimestamp(now, timezone.utc).date()
+            self._today_str = day.isoformat()
+            self._today_end = (now // 86400 + 1) * 86400
+        return self._today_str
+
+    async def validate_trade(self, trade_signal: TradeSignal) -> bool:
         """Validate trade against risk parameters"""
         try:
             # Check daily trade limit
-            today = datetime.utcnow().date().isoformat()
-            symbol_key = f"{trade_signal['symbol']}_{today}"
+            symbol_key = (trade_signal.symbol, self._today())
             
             if self.daily_trades.get(symbol_key, 0) >= self.risk_limits["max_daily_trades"]:
-                logger.warning(f"Daily trade limit reached for {trade_signal['symbol']}")
+                logger.warning(f"Daily trade limit reached for {trade_signal.symbol}")
                 return False
 
             # Validate position size
@@ -52,33 +89,31 @@ class RiskManager:
             logger.error(f"Error validating trade: {e}")
             return False
 
-    async def calculate_position_size(self, signal: Dict, account_balance: float) -> float:
+    async def calculate_position_size(self, signal: TradeSignal, account_balance: float) -> float:
         """Calculate appropriate position size based on risk parameters"""
         try:
-            # Calculate risk amount per trade
-            risk_per_trade = account_balance * self.risk_limits["stop_loss_percentage"]
-            
-            # Calculate position size based on stop loss
-            price_diff = abs(signal["entry_price"] - signal["stop_loss"])
-            risk_per_unit = price_diff / signal["entry_price"]
-            
-            position_size = risk_per_trade / risk_per_unit
-            
-            # Apply maximum position size limit
-            position_size = min(position_size, self.risk_limits["max_position_size"])
+            # Risk-based size from the stop loss distance, capped at the maximum position size
+            position_size = _position_size(
+                float(account_balance),
+                signal.entry_price,
+                signal.stop_loss,
+                float(self.risk_limits["stop_loss_percentage"]),
+                float(self.risk_limits["max_position_size"])
+            )
             
-            return float(Decimal(str(position_size)).quantize(Decimal('0.00001')))
+            # Float round() is cheaper than the old str/Decimal quantize but rounds the binary value,
+            # so sizes sitting exactly on a 5th-decimal tie can land one unit off from Decimal's result
+            return round(position_size, 5)
 
         except Exception as e:
             logger.error(f"Error calculating position size: {e}")
-            raise
+            raise RiskError(f"Could not calculate position size: {e}") from e
 
     async def update_risk_metrics(self, trade: Trade):
         """Update risk metrics after trade execution"""
         try:
             # Update daily trade count
-            today = datetime.utcnow().date().isoformat()
-            symbol_key = f"{trade.symbol}_{today}"
+            symbol_key = (trade.symbol, self._today())
             self.daily_trades[symbol_key] = self.daily_trades.get(symbol_key, 0) + 1
 
             # Update position tracking
@@ -100,17 +135,12 @@ class RiskManager:
             "exposure_limit": await self._check_exposure_limit()
         }
 
-    async def _validate_position_size(self, trade_signal: Dict) -> bool:
+    async def _validate_position_size(self, trade_signal: TradeSignal) -> bool:
         """Validate position size against limits"""
         try:
-            current_exposure = sum(
-                pos["size"] * pos["price"] 
-                for pos in self.positions.values()
-            )
-            
-            new_exposure = trade_signal["position_size"] * trade_signal["entry_price"]
+            new_exposure = trade_signal.position_size * trade_signal.entry_price
             
-            if current_exposure + new_exposure > self.risk_limits["max_position_size"]:
+            if self._current_exposure + new_exposure > self.risk_limits["max_position_size"]:
                 logger.warning("Position size exceeds maximum exposure limit")
                 return False
                 
@@ -120,10 +150,10 @@ class RiskManager:
             logger.error(f"Error validating position size: {e}")
             return False
 
-    def _validate_stop_loss(self, trade_signal: Dict) -> bool:
+    def _validate_stop_loss(self, trade_signal: TradeSignal) -> bool:
         """Validate stop loss percentage"""
         try:
-            stop_loss_pct = abs(trade_signal["entry_price"] - trade_signal["stop_loss"]) / trade_signal["entry_price"]
+            stop_loss_pct = _stop_loss_pct(trade_signal.entry_price, trade_signal.stop_loss)
             
             if stop_loss_pct > self.risk_limits["stop_loss_percentage"]:
                 logger.warning("Stop loss percentage exceeds maximum limit")
@@ -154,42 +184,59 @@ class RiskManager:
                         "price": trade.entry_price,
                         "direction": trade.direction
                     }
+                    self._current_exposure += trade.quantity * trade.entry_price
 
             except Exception as e:
                 logger.error(f"Error loading active positions: {e}")
                 raise
 
+    async def _update_position(self, trade: Trade):
+        """Track an opened or closed position and adjust the running exposure"""
+        position = self.positions.pop(trade.id, None)
+        if position:
+            self._current_exposure -= position["size"] * position["price"]
+        
+        if trade.exit_time is None:
+            self.positions[trade.id] = {
+                "symbol": trade.symbol,
+                "size": trade.quantity,
+                "price": trade.entry_price,
+                "direction": trade.direction
+            }
+            self._current_exposure += trade.quantity * trade.entry_price
+        elif not self.positions:
+            # Drop accumulated float error once everything is flat
+            self._current_exposure = 0.0
+
     async def _calculate_risk_metrics(self):
         """Calculate and store current risk metrics"""
         async for db in get_db():
             try:
-                # Updated to use SQLAlchemy 2.0 style
-                query = select(Trade).where(
-                    Trade.exit_time >= datetime.utcnow() - timedelta(days=30)
+                # Only the PnL column is needed, in the order the trades closed
+                query = (
+                    select(Trade.pnl)
+                    .where(Trade.exit_time >= datetime.utcnow() - timedelta(days=30))
+                    .order_by(Trade.exit_time)
                 )
                 result = await db.execute(query)
-                trades = result.scalars().all()
-                
-                cumulative_pnl = 0
-                max_drawdown = 0
-                peak = 0
+                pnl_values = result.scalars().all()
                 
-                for trade in trades:
-                    if trade.pnl:
-                        cumulative_pnl += trade.pnl
-                        peak = max(peak, cumulative_pnl)
-                        drawdown = peak - cumulative_pnl
-                        max_drawdown = max(max_drawdown, drawdown)
+                pnls = np.fromiter(
+                    (pnl or 0.0 for pnl in pnl_values),
+                    dtype=np.float64,
+                    count=len(pnl_values)
+                )
+                # Running peak of cumulative PnL (starting from flat) minus where we are now
+                cumulative_pnl = np.cumsum(pnls)
+                peak = np.maximum(np.maximum.accumulate(cumulative_pnl), 0.0)
+                max_drawdown = float((peak - cumulative_pnl).max(initial=0.0))
 
                 # Store metrics in Redis for quick access
                 await self.redis_client.set_data(
                     "risk_metrics",
                     {
                         "max_drawdown": max_drawdown,
-                        "current_exposure": sum(
-                            pos["size"] * pos["price"] 
-                            for pos in self.positions.values()
-                        ),
+                        "current_exposure": self._current_exposure,
                         "active_positions": len(self.positions),
                         "timestamp": datetime.utcnow().isoformat()
                     }
@@ -201,4 +248,5 @@ class RiskManager:
 
     async def stop(self):
         """Cleanup resources"""
-        await self.redis_client.disconnect() 
\ No newline at end of file
+        if self._owns_redis_client:
+            await self.redis_client.disconnect() 
\ No newline at end of file
@@ -1,12 +1,13 @@
 from typing import Dict, Optional, List
-import json
+import orjson
 from datetime import datetime
 from loguru import logger
 from openai import AsyncOpenAI
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-import asyncio
 
 from src.core.config import get_settings
+from src.core.exceptions import StrategyError
 from src.utils.redis_client import RedisClient
 from src.db.session import get_db
 from src.db.models.trading import Trade, PerformanceMetrics
@@ -14,9 +15,10 @@ from src.db.models.trading import Trade, PerformanceMetrics
 settings = get_settings()
 
 class StrategyGenerator:
-    def __init__(self):
+    def __init__(self, redis_client: Optional[RedisClient] = None):
         self.client = None
-        self.redis_client = RedisClient()
+        self._owns_redis_client = redis_client is None
+        self.redis_client = redis_client or RedisClient()
         self.assistant_id = None
         self.thread_id = None
         self.mock_mode = settings.ENABLE_MOCK_RESPONSES
@@ -24,7 +26,8 @@ class StrategyGenerator:
     async def initialize(self):
         """Initialize OpenAI assistant and thread"""
         try:
-            await self.redis_client.connect()
+            if self._owns_redis_client:
+                await self.redis_client.connect()
             
             if not settings.OPENAI_API_KEY or settings.OPENAI_API_KEY.startswith('your_'):
                 logger.warning("No valid OpenAI API key provided - running in mock mode")
@@ -72,21 +75,14 @@ class StrategyGenerator:
                 content=prompt
             )
 
-            # Run assistant
-            run = await self.client.beta.threads.runs.create(
+            # Run assistant and let the SDK poll until it reaches a terminal state
+            run = await self.client.beta.threads.runs.create_and_poll(
                 thread_id=self.thread_id,
-                assistant_id=self.assistant_id
+                assistant_id=self.assistant_id,
+                poll_interval_ms=150
             )
-
-            # Wait for completion
-            while True:
-                run_status = await self.client.beta.threads.runs.retrieve(
-                    thread_id=self.thread_id,
-                    run_id=run.id
-                )
-                if run_status.status == 'completed':
-                    break
-                await asyncio.sleep(1)
+            if run.status != 'completed':
+                raise ValueError(f"Assistant run finished with status {run.status}")
 
             # Get response
             messages = await self.client.beta.threads.messages.list(
@@ -101,8 +97,9 @@ class StrategyGenerator:
             raise ValueError("Invalid strategy generated")
 
         except Exception as e:
-            logger.error(f"Error generating strategy: {e} - falling back to mock strategy")
-            return self._generate_mock_strategy(market_data)
+            # A made-up fallback signal could be traded on; fail the request instead
+            logger.error(f"Error generating strategy: {e}")
+            raise StrategyError("Strategy generation failed") from e
 
     def _generate_mock_strategy(self, market_data: Dict) -> Dict:
         """Generate a mock strategy for testing"""
@@ -157,15 +154,17 @@ class StrategyGenerator:
         """Update strategy performance metrics"""
         async for db in get_db():
             try:
-                # Calculate metrics
-                trades = await db.query(Trade).filter(Trade.strategy_id == strategy_id).all()
+                # Aggregate in the database so only one row comes back
+                stmt = select(
+                    func.count(Trade.id),
+                    func.count(Trade.id).filter(Trade.pnl > 0),
+                    func.coalesce(func.sum(Trade.pnl), 0.0)
+                ).where(Trade.strategy_id == strategy_id)
+                result = await db.execute(stmt)
+                total_trades, winning_trades, total_pnl = result.one()
                 
-                total_trades = len(trades)
-                winning_trades = len([t for t in trades if t.pnl and t.pnl > 0])
                 win_rate = winning_trades / total_trades if total_trades > 0 else 0
                 
-                total_pnl = sum(t.pnl for t in trades if t.pnl)
-                
                 # Calculate other metrics (Sharpe ratio, drawdown etc.)
                 metrics = PerformanceMetrics(
                     strategy_id=strategy_id,
@@ -185,7 +184,7 @@ class StrategyGenerator:
 
     def _format_market_data(self, market_data: Dict) -> str:
         """Format market data for the assistant"""
-        return json.dumps({
+        return orjson.dumps({
             "request": "Generate trading strategy",
             "market_data": market_data,
             "constraints": {
@@ -196,7 +195,7 @@ class StrategyGenerator:
                     "take_profit", "position_size", "timeframe"
                 ]
             }
-        }, indent=2)
+        }, option=orjson.OPT_INDENT_2).decode()
 
     def _parse_strategy_response(self, response: str) -> Dict:
         """Parse and structure the assistant's response"""
@@ -206,7 +205,7 @@ class StrategyGenerator:
             strategy_end = response.rfind('}') + 1
             strategy_json = response[strategy_start:strategy_end]
             
-            return json.loads(strategy_json)
+            return orjson.loads(strategy_json)
             
         except Exception as e:
             logger.error(f"Error parsing strategy response: {e}")
@@ -214,4 +213,5 @@ class StrategyGenerator:
 
     async def stop(self):
         """Cleanup resources"""
-        await self.redis_client.disconnect() 
\ No newline at end of file
+        if self._owns_redis_client:
+            await self.redis_client.disconnect() 
\ No newline at end of file
@@ -1,139 +1,553 @@
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Set, Tuple
 import asyncio
+import contextlib
+import hashlib
+import hmac
+import time
+import uuid
 from datetime import datetime
+from urllib.parse import urlencode
 from loguru import logger
 import httpx
-from decimal import Decimal
-from sqlalchemy import select
+import numpy as np
+import orjson
+import random
+from websockets.asyncio.client import connect as ws_connect
+from sqlalchemy import bindparam, insert, select
 
 from src.core.config import get_settings
 from src.utils.redis_client import RedisClient
-from src.db.session import get_db
+from src.db.session import AsyncSessionLocal
 from src.db.models.trading import Trade
+from src.schemas.trading import TradeSignal
 from src.services.risk_manager import RiskManager
 
 settings = get_settings()
 
-class TradeExecutor:
-    def __init__(self):
-        self.redis_client = RedisClient()
-        self.risk_manager = RiskManager()
-        self.active_orders: Dict[str, Dict] = {}
-        self.http_client = httpx.AsyncClient()
-        self.exchange_apis = {
-            "binance": {
-                "base_url": "https://api.binance.com",
-                "endpoints": {
-                    "order": "/api/v3/order",
-                    "position": "/api/v3/position"
-                }
-            },
-            "deribit": {
-                "base_url": "https://www.deribit.com/api/v2",
-                "endpoints": {
-                    "order": "/private/buy",
-                    "position": "/private/get_position"
-                }
-            }
+# Statements are built once; the engine's compiled cache then reuses their SQL
+_TRADE_INSERT = insert(Trade.__table__)
+# Only the OrderRow fields, as plain rows: no ORM instances are built on load, and the
+# Float columns arrive as floats, so there is no Decimal to convert
+_ACTIVE_TRADES_SELECT = select(
+    Trade.order_id, Trade.id, Trade.symbol, Trade.direction,
+    Trade.entry_price, Trade.quantity, Trade.status
+).where(
+    Trade.exit_time.is_(None),
+    Trade.status == "FILLED"
+)
+_TRADE_BY_ID_SELECT = select(Trade).where(Trade.id == bindparam("trade_id"))
+_TRADE_BY_ORDER_SELECT = select(Trade).where(Trade.order_id == bindparam("order_id"))
+
+# Queued after the last trade on shutdown; tells _trade_writer to flush and return
+_STOP_WRITER = object()
+
+# Redis hash of order_id -> order, shared by workers so restarts skip the DB scan
+ACTIVE_ORDERS_KEY = "active_orders"
+
+EXCHANGE_APIS = {
+    "binance": {
+        "base_url": "https://api.binance.com",
+        "endpoints": {
+            "order": "/api/v3/order",
+            "open_orders": "/api/v3/openOrders",
+            "user_stream": "/api/v3/userDataStream",
+            "account": "/api/v3/account",
+            "position": "/api/v3/position"
         }
+    },
+    "deribit": {
+        "base_url": "https://www.deribit.com/api/v2",
+        "endpoints": {
+            "order": "/private/buy",
+            "open_orders": "/private/get_open_orders",
+            "account": "/private/get_account_summary",
+            "position": "/private/get_position"
+        }
+    }
+}
+
+BINANCE_USER_STREAM_URL = "wss://stream.binance.com:9443/ws"
+# Binance expires a listenKey after 60 minutes without a keepalive
+LISTEN_KEY_KEEPALIVE_INTERVAL = 30 * 60
+
+# Seconds a resolved OrderTicket stays queryable
+TICKET_RETENTION = 300
+
+# Exchange order states that take an order off the book without a fill
+CLOSED_ORDER_STATES = {"CANCELLED", "CANCELED", "EXPIRED", "REJECTED"}
+
+def create_exchange_clients() -> Dict[str, httpx.AsyncClient]:
+    """Build one pooled keep-alive client per exchange, pinned to its base URL"""
+    limits = httpx.Limits(
+        max_connections=settings.EXCHANGE_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.EXCHANGE_MAX_CONNECTIONS,
+        keepalive_expiry=30
+    )
+    return {
+        exchange: httpx.AsyncClient(
+            base_url=api["base_url"],
+            http2=True,
+            limits=limits,
+            timeout=httpx.Timeout(settings.HTTP_TIMEOUT)
+        )
+        for exchange, api in EXCHANGE_APIS.items()
+    }
+
+class OrderRow:
+    """Compact record for a tracked order"""
+    __slots__ = ("order_id", "symbol", "side", "price", "quantity", "status", "exchange")
+
+    def __init__(
+        self,
+        order_id: str,
+        symbol: str,
+        side: str,
+        price: float,
+        quantity: float,
+        status: str,
+        exchange: str = "binance"
+    ):
+        self.order_id = order_id
+        self.symbol = symbol
+        self.side = side
+        self.price = price
+        self.quantity = quantity
+        self.status = status
+        self.exchange = exchange
+
+    @classmethod
+    def from_dict(cls, order: Dict) -> "OrderRow":
+        return cls(
+            str(order["order_id"]),
+            order["symbol"],
+            order["side"],
+            order["price"],
+            order["quantity"],
+            order["status"],
+            order.get("exchange", "binance")
+        )
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+class OrderTicket:
+    """Handle returned by queue_trade; done once submitted, status tracks the order after that"""
+    __slots__ = ("ticket_id", "status", "order_id", "done")
+
+    def __init__(self):
+        self.ticket_id = str(uuid.uuid4())
+        self.status = "NEW"
+        self.order_id: Optional[str] = None
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> Dict:
+        return {"ticket_id": self.ticket_id, "status": self.status, "order_id": self.order_id}
+
+class TradeExecutor:
+    def __init__(
+        self,
+        http_clients: Optional[Dict[str, httpx.AsyncClient]] = None,
+        redis_client: Optional[RedisClient] = None,
+        risk_manager: Optional[RiskManager] = None
+    ):
+        # Shared client injected by the app lifespan, which connects and closes it
+        self._owns_redis_client = redis_client is None
+        self.redis_client = redis_client or RedisClient()
+        # An injected risk manager is shared with the API and initialized by its owner
+        self._owns_risk_manager = risk_manager is None
+        self.risk_manager = risk_manager or RiskManager(redis_client=self.redis_client)
+        self.active_orders: Dict[str, OrderRow] = {}
+        # Same orders grouped by exchange, so bulk status checks iterate exchanges not orders
+        self.orders_by_exchange: Dict[str, Dict[str, OrderRow]] = {}
+        # Per-exchange clients injected by the app lifespan; otherwise built in initialize()
+        self._owns_http_clients = http_clients is None
+        self.http_clients: Dict[str, httpx.AsyncClient] = http_clients or {}
+        self.exchange_apis = EXCHANGE_APIS
+        # Bounds in-flight status polls so a large book stays under exchange rate limits
+        self._status_limiter = asyncio.Semaphore(settings.ORDER_STATUS_CONCURRENCY)
+        # exchange -> (balance, monotonic expiry)
+        self._balance_cache: Dict[str, Tuple[float, float]] = {}
+        # Trade rows waiting for the batched writer
+        self._trade_queue: asyncio.Queue = asyncio.Queue()
+        self._trade_writer_task: Optional[asyncio.Task] = None
+        # Orders accepted by queue_trade, waiting for the submit worker
+        self._order_queue: asyncio.Queue = asyncio.Queue()
+        self._submit_limiter = asyncio.Semaphore(settings.ORDER_SUBMIT_CONCURRENCY)
+        self._submit_tasks: Set[asyncio.Task] = set()
+        self._submit_worker_task: Optional[asyncio.Task] = None
+        # ticket_id -> ticket; finished tickets are dropped after TICKET_RETENTION seconds
+        self.tickets: Dict[str, OrderTicket] = {}
+        # Exchange order id -> ticket of a submitted order that is still live
+        self._tickets_by_order: Dict[str, OrderTicket] = {}
+        self._user_stream_tasks: List[asyncio.Task] = []
+        # Exchanges whose user-data stream is currently connected
+        self._streamed_exchanges: Set[str] = set()
 
     async def initialize(self):
         """Initialize trade executor"""
         try:
-            await self.redis_client.connect()
-            await self.risk_manager.initialize()
+            if self._owns_http_clients and not self.http_clients:
+                # Built on the running loop rather than at construction time
+                self.http_clients = create_exchange_clients()
+            if self._owns_redis_client:
+                await self.redis_client.connect()
+            if self._owns_risk_manager:
+                await self.risk_manager.initialize()
             # Load active orders from database
             await self._load_active_trades()
+            self._trade_writer_task = asyncio.create_task(self._trade_writer())
+            self._submit_worker_task = asyncio.create_task(self._submit_worker())
+            # Deribit has no credentials configured yet, so it relies on the reconcile loop
+            if settings.BINANCE_API_KEY and settings.ENABLE_EXCHANGE_STREAMS:
+                self._user_stream_tasks.append(asyncio.create_task(self._binance_user_stream()))
         except Exception as e:
             logger.error(f"Error initializing trade executor: {e}")
             raise
 
     async def _load_active_trades(self):
-        """Load active trades from database"""
-        async for db in get_db():
+        """Load active trades from the Redis cache, falling back to the database"""
+        cached = await self.redis_client.hgetall_data(ACTIVE_ORDERS_KEY)
+        if cached:
+            for order in cached.values():
+                self._track_order(OrderRow.from_dict(order))
+            return
+
+        async with AsyncSessionLocal() as db:
             try:
-                query = select(Trade).where(
-                    Trade.exit_time.is_(None),
-                    Trade.status == "FILLED"
-                )
-                result = await db.execute(query)
-                trades = result.scalars().all()
+                result = await db.execute(_ACTIVE_TRADES_SELECT)
                 
-                for trade in trades:
-                    self.active_orders[str(trade.id)] = {
-                        "order_id": str(trade.id),
-                        "symbol": trade.symbol,
-                        "side": trade.direction,
-                        "price": trade.entry_price,
-                        "quantity": trade.quantity,
-                        "status": trade.status,
-                        "exchange": trade.exchange if hasattr(trade, 'exchange') else "binance"
-                    }
+                # Trade has no exchange column; everything persisted so far is Binance
+                for order_id, trade_id, symbol, direction, price, quantity, status in result:
+                    self._track_order(OrderRow(
+                        order_id or str(trade_id), symbol, direction, price, quantity, status
+                    ))
+
+                await self.redis_client.hset_data(
+                    ACTIVE_ORDERS_KEY,
+                    {order_id: row.to_dict() for order_id, row in self.active_orders.items()}
+                )
                     
             except Exception as e:
                 logger.error(f"Error loading active trades: {e}")
                 raise
 
-    async def execute_trade(self, trade_signal: Dict) -> Optional[Dict]:
+    async def execute_trade(self, trade_signal: TradeSignal) -> Optional[Dict]:
         """Execute trade on the exchange"""
         try:
-            # Validate trade with risk manager
-            if not await self.risk_manager.validate_trade(trade_signal):
-                logger.warning("Trade rejected by risk manager")
+            position_size = await self._prepare_trade(trade_signal)
+            if position_size is None:
                 return None
+            return await self._submit_order(trade_signal, position_size)
 
-            # Calculate position size
-            account_balance = await self._get_account_balance(trade_signal["exchange"])
-            position_size = await self.risk_manager.calculate_position_size(
-                trade_signal, 
-                account_balance
-            )
+        except Exception as e:
+            logger.error(f"Error executing trade: {e}")
+            return None
 
-            # Place order
-            order = await self._place_order(trade_signal, position_size)
-            if order:
-                # Track order
-                self.active_orders[order["order_id"]] = order
-                
-                # Store trade in database
-                await self._store_trade(order)
-                
-                # Update risk metrics
-                await self.risk_manager.update_risk_metrics(order)
-                
-                return order
+    async def queue_trade(self, trade_signal: TradeSignal) -> Optional[OrderTicket]:
+        """Validate and size a trade, then hand it to the submit worker without waiting"""
+        try:
+            position_size = await self._prepare_trade(trade_signal)
+            if position_size is None:
+                return None
+            ticket = OrderTicket()
+            self.tickets[ticket.ticket_id] = ticket
+            await self._order_queue.put((ticket, trade_signal, position_size))
+            return ticket
 
         except Exception as e:
-            logger.error(f"Error executing trade: {e}")
+            logger.error(f"Error queueing trade: {e}")
+            return None
+
+    async def _prepare_trade(self, trade_signal: TradeSignal) -> Optional[float]:
+        """Run risk checks and return the position size, or None if rejected"""
+        # Validate trade with risk manager
+        if not await self.risk_manager.validate_trade(trade_signal):
+            logger.warning("Trade rejected by risk manager")
             return None
 
+        # Calculate position size
+        account_balance = await self._get_cached_balance(trade_signal.exchange)
+        return await self.risk_manager.calculate_position_size(
+            trade_signal, 
+            account_balance
+        )
+
+    async def _submit_order(self, trade_signal: TradeSignal, position_size: float) -> Optional[Dict]:
+        """Place an order and start tracking it"""
+        order = await self._place_order(trade_signal, position_size)
+        if order:
+            # Track order
+            row = OrderRow.from_dict(order)
+            self._track_order(row)
+            await self.redis_client.hset_data(ACTIVE_ORDERS_KEY, {row.order_id: row.to_dict()})
+            
+            # Store trade in database
+            await self._store_trade(order)
+            
+            # Update risk metrics
+            await self.risk_manager.update_risk_metrics(order)
+            
+        return order
+
+    async def _submit_worker(self):
+        """Submit queued orders, at most ORDER_SUBMIT_CONCURRENCY at a time"""
+        while True:
+            # Take a slot before the order, so a cancelled worker never holds a dequeued ticket
+            await self._submit_limiter.acquire()
+            try:
+                ticket, trade_signal, position_size = await self._order_queue.get()
+            except BaseException:
+                self._submit_limiter.release()
+                raise
+            task = asyncio.create_task(self._submit_ticket(ticket, trade_signal, position_size))
+            self._submit_tasks.add(task)
+            task.add_done_callback(self._submit_tasks.discard)
+
+    async def _submit_ticket(self, ticket: OrderTicket, trade_signal: TradeSignal, position_size: float):
+        """Place one queued order and resolve its ticket"""
+        try:
+            order = await self._submit_order(trade_signal, position_size)
+            if order:
+                ticket.order_id = str(order["order_id"])
+                ticket.status = order.get("status", "SUBMITTED")
+                # Later fills and cancels reach the ticket through its order id
+                self._tickets_by_order[ticket.order_id] = ticket
+            else:
+                ticket.status = "REJECTED"
+        except Exception as e:
+            logger.error(f"Error submitting order for ticket {ticket.ticket_id}: {e}")
+            ticket.status = "REJECTED"
+        finally:
+            self._submit_limiter.release()
+            ticket.done.set()
+            if ticket.order_id not in self._tickets_by_order:
+                self._retire_ticket(ticket)
+
+    def _retire_ticket(self, ticket: OrderTicket):
+        """Keep a finished ticket queryable for TICKET_RETENTION seconds, then drop it"""
+        asyncio.get_running_loop().call_later(
+            TICKET_RETENTION, self.tickets.pop, ticket.ticket_id, None
+        )
+
+    def _update_ticket(self, order_id: str, status: Dict):
+        """Mirror an order's reported state onto its ticket; retire it once the order is done"""
+        ticket = self._tickets_by_order.get(order_id)
+        # UNKNOWN is a failed poll, not an exchange state
+        if ticket is None or status["status"] == "UNKNOWN":
+            return
+        ticket.status = status["status"]
+        if order_id not in self.active_orders:
+            del self._tickets_by_order[order_id]
+            self._retire_ticket(ticket)
+
     async def manage_open_positions(self):
-        """Monitor and manage open positions"""
+        """Poll exchanges without a live user stream; reconcile streamed ones as a safety net"""
+        loop = asyncio.get_running_loop()
+        next_reconcile = 0.0
         while True:
             try:
-                for order_id, order in list(self.active_orders.items()):
-                    # Check order status
-                    status = await self._check_order_status(order)
-                    
-                    if status["status"] == "FILLED":
-                        # Update position tracking
-                        await self._update_position(order_id, status)
-                        
-                    elif status["status"] == "CANCELLED":
-                        # Remove from tracking
-                        await self._cleanup_order(order_id)
+                reconcile = loop.time() >= next_reconcile
+                if reconcile:
+                    next_reconcile = loop.time() + settings.ORDER_RECONCILE_INTERVAL
+                exchanges = [
+                    exchange for exchange, orders in self.orders_by_exchange.items()
+                    if orders and (reconcile or exchange not in self._streamed_exchanges)
+                ]
 
-                await asyncio.sleep(1)  # Check every second
+                updates = []
+                for order_id, status in await self._collect_order_statuses(exchanges):
+                    if isinstance(status, BaseException):
+                        logger.error(f"Error polling order {order_id}: {status}")
+                    else:
+                        updates.append(self._apply_order_status(order_id, status))
+                await asyncio.gather(*updates)
+
+                await asyncio.sleep(settings.ORDER_POLL_INTERVAL)
 
             except Exception as e:
                 logger.error(f"Error managing positions: {e}")
                 await asyncio.sleep(5)
 
+    async def _apply_order_status(self, order_id: str, status: Dict):
+        """Act on an order state reported by a poll or a user-stream event"""
+        try:
+            if status["status"] == "FILLED":
+                await self._handle_fill(order_id, status)
+            elif status["status"] in CLOSED_ORDER_STATES:
+                # Remove from tracking
+                await self._cleanup_order(order_id)
+            self._update_ticket(order_id, status)
+        except Exception as e:
+            # One bad update must not take down the stream or the poll loop
+            logger.error(f"Error applying status {status.get('status')} to order {order_id}: {e}")
+
+    async def _handle_fill(self, order_id: str, status: Dict):
+        """Record a fill on the trade, then stop tracking the order"""
+        await self._record_entry_fill(order_id, status)
+        await self._cleanup_order(order_id)
+
+    async def _record_entry_fill(self, order_id: str, status: Dict):
+        """Mark the trade opened by an entry order as filled; the position stays open"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(_TRADE_BY_ORDER_SELECT, {"order_id": order_id})
+            trade = result.scalars().first()
+            if trade is None:
+                logger.warning(f"No trade recorded for filled order {order_id}")
+                return
+            trade.status = "FILLED"
+            if status.get("price"):
+                trade.entry_price = float(status["price"])
+            await db.commit()
+
+        # Opens the position in the risk manager; exit_time stays unset until it closes
+        await self.risk_manager.update_risk_metrics(trade)
+
+    async def _binance_user_stream(self):
+        """Apply Binance order updates as they are pushed over the user-data stream"""
+        client = self.http_clients["binance"]
+        endpoint = self.exchange_apis["binance"]["endpoints"]["user_stream"]
+        headers = {"X-MBX-APIKEY": settings.BINANCE_API_KEY}
+        attempts = 0
+        while True:
+            keepalive = None
+            try:
+                response = await client.post(endpoint, headers=headers)
+                response.raise_for_status()
+                listen_key = response.json()["listenKey"]
+                keepalive = asyncio.create_task(
+                    self._keep_listen_key_alive(client, endpoint, headers, listen_key)
+                )
+
+                async with ws_connect(f"{BINANCE_USER_STREAM_URL}/{listen_key}") as ws:
+                    attempts = 0
+                    self._streamed_exchanges.add("binance")
+                    async for message in ws:
+                        event = orjson.loads(message)
+                        if event.get("e") != "executionReport":
+                            continue
+                        order_id = str(event["i"])
+                        if order_id in self.active_orders:
+                            await self._apply_order_status(
+                                order_id, {"status": event["X"], "price": float(event["L"])}
+                            )
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                delay = min(settings.WEBSOCKET_RECONNECT_MAX_DELAY, 2 ** attempts) + random.random()
+                attempts += 1
+                logger.error(f"Binance user stream error: {e}; reconnecting in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            finally:
+                # Fall back to fast polling until the stream is back
+                self._streamed_exchanges.discard("binance")
+                if keepalive:
+                    keepalive.cancel()
+
+    async def _keep_listen_key_alive(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        headers: Dict,
+        listen_key: str
+    ):
+        """Extend the listenKey before Binance expires it"""
+        while True:
+            await asyncio.sleep(LISTEN_KEY_KEEPALIVE_INTERVAL)
+            try:
+                await client.put(endpoint, params={"listenKey": listen_key}, headers=headers)
+            except Exception as e:
+                logger.error(f"Error refreshing Binance listenKey: {e}")
+
+    async def _get_cached_balance(self, exchange: str) -> float:
+        """Account balance, re-fetched at most once per ACCOUNT_BALANCE_CACHE_TTL"""
+        now = time.monotonic()
+        cached = self._balance_cache.get(exchange)
+        if cached and cached[1] > now:
+            return cached[0]
+        balance = await self._get_account_balance(exchange)
+        self._balance_cache[exchange] = (balance, now + settings.ACCOUNT_BALANCE_CACHE_TTL)
+        return balance
+
+    async def _get_account_balance(self, exchange: str) -> float:
+        """Fetch the free balance used for position sizing from the exchange"""
+        client = self.http_clients[exchange]
+        endpoint = self.exchange_apis[exchange]["endpoints"]["account"]
+
+        if exchange == "deribit":
+            response = await client.get(
+                endpoint,
+                params={"currency": settings.DERIBIT_BALANCE_CURRENCY},
+                headers=self._get_auth_headers(exchange)
+            )
+            response.raise_for_status()
+            return float(response.json()["result"]["available_funds"])
+
+        response = await client.get(
+            endpoint,
+            params=self._sign_binance_params({}),
+            headers=self._get_auth_headers(exchange)
+        )
+        response.raise_for_status()
+        for balance in response.json()["balances"]:
+            if balance["asset"] == settings.BINANCE_BALANCE_ASSET:
+                return float(balance["free"])
+        return 0.0
+
+    def _sign_binance_params(self, params: Dict) -> Dict:
+        """Add the timestamp and HMAC-SHA256 signature Binance requires on signed endpoints"""
+        signed = {**params, "timestamp": int(time.time() * 1000)}
+        signed["signature"] = hmac.new(
+            (settings.BINANCE_API_SECRET or "").encode(),
+            urlencode(signed).encode(),
+            hashlib.sha256
+        ).hexdigest()
+        return signed
+
+    def _track_order(self, order: OrderRow):
+        """Start tracking an order in both the flat and per-exchange maps"""
+        self.active_orders[order.order_id] = order
+        self.orders_by_exchange.setdefault(order.exchange, {})[order.order_id] = order
+
+    async def _cleanup_order(self, order_id: str):
+        """Stop tracking an order that is no longer live"""
+        order = self.active_orders.pop(order_id, None)
+        if order is not None:
+            self.orders_by_exchange.get(order.exchange, {}).pop(order_id, None)
+        await self.redis_client.hdel_data(ACTIVE_ORDERS_KEY, order_id)
+
+    async def _collect_order_statuses(self, exchanges: List[str]) -> List[Tuple[str, Dict]]:
+        """Resolve the status of every order tracked on the given exchanges, one bulk call each"""
+        open_by_exchange = await asyncio.gather(
+            *(self._check_all_order_statuses(exchange) for exchange in exchanges),
+            return_exceptions=True
+        )
+
+        # Orders still on the book need nothing more; only those that left it are checked singly
+        to_poll = []
+        for exchange, open_orders in zip(exchanges, open_by_exchange):
+            orders = self.orders_by_exchange[exchange]
+            if isinstance(open_orders, BaseException):
+                logger.error(f"Bulk status check failed for {exchange}: {open_orders}")
+                to_poll.extend(orders.items())
+                continue
+            to_poll.extend(
+                (order_id, order) for order_id, order in orders.items()
+                if order_id not in open_orders
+            )
+
+        statuses = await asyncio.gather(
+            *(self._poll_order_status(order) for _, order in to_poll),
+            return_exceptions=True
+        )
+        return [(order_id, status) for (order_id, _), status in zip(to_poll, statuses)]
+
     async def update_trade_status(self, trade_id: str, status: Dict):
         """Update trade status and related metrics"""
         try:
-            async for db in get_db():
-                trade = await db.query(Trade).filter(Trade.id == trade_id).first()
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(_TRADE_BY_ID_SELECT, {"trade_id": int(trade_id)})
+                trade = result.scalars().first()
                 if trade:
                     trade.status = status["status"]
                     if status["status"] == "FILLED":
@@ -142,6 +556,10 @@ class TradeExecutor:
                         trade.pnl = self._calculate_pnl(trade, status["price"])
                     
                     await db.commit()
+
+                    if trade.exit_time is not None:
+                        # Closed trades are no longer active; drop them from the shared cache
+                        await self.redis_client.hdel_data(ACTIVE_ORDERS_KEY, str(trade_id))
                     
                     # Update risk metrics
                     await self.risk_manager.update_risk_metrics(trade)
@@ -150,10 +568,10 @@ class TradeExecutor:
             logger.error(f"Error updating trade status: {e}")
             raise
 
-    async def _place_order(self, trade_signal: Dict, position_size: float) -> Optional[Dict]:
+    async def _place_order(self, trade_signal: TradeSignal, position_size: float) -> Optional[Dict]:
         """Place order on exchange"""
         try:
-            exchange = trade_signal["exchange"]
+            exchange = trade_signal.exchange
             api_config = self.exchange_apis[exchange]
             
             payload = self._format_order_payload(
@@ -162,113 +580,198 @@ class TradeExecutor:
                 position_size
             )
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{api_config['base_url']}{api_config['endpoints']['order']}",
-                    json=payload,
-                    headers=self._get_auth_headers(exchange)
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    logger.error(f"Order placement failed: {response.text}")
-                    return None
+            response = await self.http_clients[exchange].post(
+                api_config["endpoints"]["order"],
+                json=payload,
+                headers=self._get_auth_headers(exchange)
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            else:
+                logger.error(f"Order placement failed: {response.text}")
+                return None
 
         except Exception as e:
             logger.error(f"Error placing order: {e}")
             return None
 
-    async def _check_order_status(self, order: Dict) -> Dict:
+    async def _check_all_order_statuses(self, exchange: str) -> Dict[str, str]:
+        """Fetch every open order on an exchange in one call, as order_id -> status"""
+        # openOrders is a SIGNED endpoint on Binance; Deribit takes no signature here
+        params = self._sign_binance_params({}) if exchange == "binance" else None
+        response = await self.http_clients[exchange].get(
+            self.exchange_apis[exchange]["endpoints"]["open_orders"],
+            params=params,
+            headers=self._get_auth_headers(exchange)
+        )
+        response.raise_for_status()
+        payload = response.json()
+
+        if exchange == "deribit":
+            return {str(o["order_id"]): o["order_state"] for o in payload["result"]}
+        return {str(o["orderId"]): o["status"] for o in payload}
+
+    async def _poll_order_status(self, order: OrderRow) -> Dict:
+        """Check order status under the shared concurrency limit"""
+        async with self._status_limiter:
+            return await self._check_order_status(order)
+
+    async def _check_order_status(self, order: OrderRow) -> Dict:
         """Check order status on exchange"""
         try:
-            exchange = order["exchange"]
+            exchange = order.exchange
             api_config = self.exchange_apis[exchange]
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{api_config['base_url']}{api_config['endpoints']['order']}",
-                    params={"orderId": order["order_id"]},
-                    headers=self._get_auth_headers(exchange)
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    logger.error(f"Status check failed: {response.text}")
-                    return {"status": "UNKNOWN"}
+            response = await self.http_clients[exchange].get(
+                api_config["endpoints"]["order"],
+                params={"orderId": order.order_id},
+                headers=self._get_auth_headers(exchange)
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            else:
+                logger.error(f"Status check failed: {response.text}")
+                return {"status": "UNKNOWN"}
 
         except Exception as e:
             logger.error(f"Error checking order status: {e}")
             return {"status": "UNKNOWN"}
 
-    def _format_order_payload(self, exchange: str, signal: Dict, size: float) -> Dict:
+    def _format_order_payload(self, exchange: str, signal: TradeSignal, size: float) -> Dict:
         """Format order payload for specific exchange"""
         if exchange == "binance":
             return {
-                "symbol": signal["symbol"],
-                "side": signal["action"],
+                "symbol": signal.symbol,
+                "side": signal.action,
                 "type": "LIMIT",
                 "quantity": size,
-                "price": signal["entry_price"],
+                "price": signal.entry_price,
                 "timeInForce": "GTC",
-                "stopPrice": signal["stop_loss"],
-                "takeProfit": signal["take_profit"]
+                "stopPrice": signal.stop_loss,
+                "takeProfit": signal.take_profit
             }
         elif exchange == "deribit":
             return {
-                "instrument_name": signal["symbol"],
+                "instrument_name": signal.symbol,
                 "amount": size,
                 "type": "limit",
-                "price": signal["entry_price"],
-                "stop_loss": signal["stop_loss"],
-                "take_profit": signal["take_profit"]
+                "price": signal.entry_price,
+                "stop_loss": signal.stop_loss,
+                "take_profit": signal.take_profit
             }
         return {}
 
     def _get_auth_headers(self, exchange: str) -> Dict:
         """Get authentication headers for exchange API"""
-        # Implementation depends on exchange authentication requirements
+        if exchange == "binance" and settings.BINANCE_API_KEY:
+            return {"X-MBX-APIKEY": settings.BINANCE_API_KEY}
+        # Deribit authentication is not configured yet
         return {}
 
     async def _store_trade(self, order: Dict):
-        """Store trade in database"""
-        async for db in get_db():
-            try:
-                trade = Trade(
-                    symbol=order["symbol"],
-                    direction=order["side"],
-                    entry_price=order["price"],
-                    quantity=order["quantity"],
-                    status=order["status"],
-                    strategy_id=order.get("strategy_id"),
-                    entry_time=datetime.utcnow()
-                )
-                db.add(trade)
-                await db.commit()
+        """Queue a trade for the next batched insert"""
+        await self._trade_queue.put({
+            "order_id": str(order["order_id"]),
+            "symbol": order["symbol"],
+            "direction": order["side"],
+            "entry_price": order["price"],
+            "quantity": order["quantity"],
+            "status": order["status"],
+            "strategy_id": order.get("strategy_id"),
+            "entry_time": datetime.utcnow()
+        })
 
-            except Exception as e:
-                logger.error(f"Error storing trade: {e}")
-                await db.rollback()
-                raise
+    async def _trade_writer(self):
+        """Insert queued trades in batches of up to TRADE_WRITE_BATCH_SIZE or every flush interval"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            row = await self._trade_queue.get()
+            if row is _STOP_WRITER:
+                return
+            rows = [row]
+            deadline = loop.time() + settings.TRADE_WRITE_FLUSH_INTERVAL
+            while len(rows) < settings.TRADE_WRITE_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._trade_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is _STOP_WRITER:
+                    # Everything queued before the sentinel is in this batch; write it and exit
+                    stopping = True
+                    break
+                rows.append(row)
+            await self._write_trades(rows)
+
+    async def _write_trades(self, rows: List[Dict]):
+        """Write a batch of trades in one transaction"""
+        if not rows:
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(_TRADE_INSERT, rows)
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Error storing {len(rows)} trades: {e}")
 
     def _calculate_pnl(self, trade: Trade, exit_price: float) -> float:
         """Calculate PnL for a trade"""
         try:
-            entry_value = float(trade.entry_price) * float(trade.quantity)
-            exit_value = float(exit_price) * float(trade.quantity)
-            
-            if trade.direction == "LONG":
-                return exit_value - entry_value
-            else:
-                return entry_value - exit_value
+            # Prices are Float columns, so this is plain float math with no Decimal hops
+            return trade.sign * (float(exit_price) - trade.entry_price) * trade.quantity
 
         except Exception as e:
             logger.error(f"Error calculating PnL: {e}")
             return 0.0
 
+    def _calculate_pnl_batch(self, trades: List[Trade], exit_prices: List[float]) -> np.ndarray:
+        """Calculate PnL for many trades in one vectorized pass"""
+        n = len(trades)
+        entry = np.fromiter((t.entry_price for t in trades), dtype=np.float64, count=n)
+        quantity = np.fromiter((t.quantity for t in trades), dtype=np.float64, count=n)
+        sign = np.fromiter((t.sign for t in trades), dtype=np.float64, count=n)
+        exit_ = np.asarray(exit_prices, dtype=np.float64)
+        return np.multiply((exit_ - entry) * quantity, sign)
+
     async def stop(self):
         """Cleanup resources"""
-        await self.redis_client.disconnect()
-        await self.risk_manager.stop()
-        await self.http_client.aclose() 
\ No newline at end of file
+        for task in self._user_stream_tasks:
+            task.cancel()
+        await asyncio.gather(*self._user_stream_tasks, return_exceptions=True)
+
+        if self._submit_worker_task:
+            self._submit_worker_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._submit_worker_task
+        # Let orders already in flight finish so their trades reach the writer
+        if self._submit_tasks:
+            await asyncio.gather(*self._submit_tasks, return_exceptions=True)
+        # Orders never submitted are cancelled so callers waiting on their tickets return
+        while not self._order_queue.empty():
+            ticket, _, _ = self._order_queue.get_nowait()
+            ticket.status = "CANCELLED"
+            ticket.done.set()
+            self._retire_ticket(ticket)
+
+        # The sentinel lets the writer finish its in-flight batch and drain the queue
+        if self._trade_writer_task and not self._trade_writer_task.done():
+            await self._trade_queue.put(_STOP_WRITER)
+            await self._trade_writer_task
+        else:
+            # No writer left to drain the queue; write whatever is still in it
+            pending = []
+            while not self._trade_queue.empty():
+                pending.append(self._trade_queue.get_nowait())
+            await self._write_trades([row for row in pending if row is not _STOP_WRITER])
+
+        if self._owns_risk_manager:
+            await self.risk_manager.stop()
+        if self._owns_redis_client:
+            await self.redis_client.disconnect()
+        if self._owns_http_clients:
+            await asyncio.gather(*(client.aclose() for client in self.http_clients.values()))
@@ -1,11 +1,25 @@
 from clickhouse_driver.asyncio import Client
-from core.config import get_settings
+from src.core.config import get_settings
+from collections import defaultdict
+from typing import Dict, List, Optional
+import asyncio
+import contextlib
+from loguru import logger
 
 settings = get_settings()
 
+# ClickHouse creates a part per INSERT, so rows are buffered and written in bulk
+FLUSH_INTERVAL = 0.1
+FLUSH_ROWS = 1000
+# Smaller buffers are still written at least this often
+FLUSH_MAX_AGE = 1.0
+
 class ClickHouseClient:
     def __init__(self):
         self.client = None
+        self._buf: Dict[str, List[dict]] = defaultdict(list)
+        self._flush_task: Optional[asyncio.Task] = None
+        self._allowed_tables = frozenset(settings.CLICKHOUSE_TABLES)
 
     async def connect(self):
         """Connect to ClickHouse"""
@@ -15,19 +29,53 @@ class ClickHouseClient:
                 port=settings.CLICKHOUSE_PORT,
                 database=settings.CLICKHOUSE_DB
             )
+        if not self._flush_task:
+            self._flush_task = asyncio.create_task(self._flusher())
 
     async def store_analytics(self, table: str, data: dict):
-        """Store analytics data"""
+        """Buffer an analytics row for the next bulk insert"""
+        # The table name is formatted into the SQL, so it must be one we know
+        if table not in self._allowed_tables:
+            raise ValueError(f"Unknown analytics table: {table}")
+        if not all(column.isidentifier() for column in data):
+            raise ValueError(f"Invalid column name in analytics row for {table}")
         if not self.client:
             await self.connect()
-            
-        query = f"""
-        INSERT INTO {table} FORMAT JSONEachRow
-        {data}
-        """
-        await self.client.execute(query)
+
+        self._buf[table].append(data)
+
+    async def _flusher(self):
+        """Write out tables that reached FLUSH_ROWS, and everything every FLUSH_MAX_AGE"""
+        loop = asyncio.get_running_loop()
+        last_full_flush = loop.time()
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            flush_all = loop.time() - last_full_flush >= FLUSH_MAX_AGE
+            if flush_all:
+                last_full_flush = loop.time()
+            for table in [t for t, rows in self._buf.items() if flush_all or len(rows) >= FLUSH_ROWS]:
+                await self._flush_table(table)
+
+    async def _flush_table(self, table: str):
+        """Insert all buffered rows for a table in one call"""
+        rows = self._buf.pop(table, None)
+        if not rows:
+            return
+        try:
+            # Values go over the native protocol as data, never through the query text
+            columns = ", ".join(rows[0])
+            await self.client.execute(f"INSERT INTO {table} ({columns}) VALUES", rows)
+        except Exception as e:
+            logger.error(f"Error storing {len(rows)} analytics rows in {table}: {e}")
 
     async def close(self):
-        """Close connection"""
+        """Flush buffered rows and close connection"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        for table in list(self._buf):
+            await self._flush_table(table)
         if self.client:
-            await self.client.disconnect() 
\ No newline at end of file
+            await self.client.disconnect()
\ No newline at end of file
@@ -0,0 +1,9 @@
+try:
+    from numba import njit
+except ImportError:  # numba is optional - fall back to plain Python functions
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+__all__ = ["njit"]
@@ -1,10 +1,43 @@
 from redis.asyncio import Redis
 from src.core.config import get_settings
-from typing import Optional, Any
-import json
+from typing import Optional, Any, Awaitable, Callable, Dict, List, Tuple
+from datetime import date, datetime
+import asyncio
+import enum
+import msgpack
+import orjson
+import uuid
 
 settings = get_settings()
 
+def _encode_default(value: Any) -> Any:
+    """Fallback for types msgpack can't pack natively"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+# packb builds a fresh Packer per call; reuse one (safe on a single event loop thread)
+_packer = msgpack.Packer(use_bin_type=True, default=_encode_default)
+
+def _pack(value: Any) -> bytes:
+    return _packer.pack(value)
+
+def _unpack(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False)
+
+# Single-flight lock for get_or_set; the token makes release a compare-and-delete
+_LOCK_TTL_MS = 3000
+_RELEASE_LOCK = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+# How long a loader's "not found" is remembered, so waiters and repeat misses skip the loader
+_MISS_TTL_MS = 1000
+
 class RedisClient:
     def __init__(self):
         self.redis: Optional[Redis] = None
@@ -15,7 +48,8 @@ class RedisClient:
                 host=settings.REDIS_HOST,
                 port=settings.REDIS_PORT,
                 db=settings.REDIS_DB,
-                decode_responses=True
+                # Cached values are msgpack bytes, so don't decode responses
+                decode_responses=False
             )
 
     async def disconnect(self) -> None:
@@ -25,11 +59,96 @@ class RedisClient:
 
     async def set_data(self, key: str, value: Any, expire: int = 15) -> None:
         """Store data with 15-second default expiry"""
-        await self.redis.set(key, json.dumps(value), ex=expire)
+        await self.redis.set(key, _pack(value), ex=expire)
+
+    async def set_many(self, items: List[Tuple[str, Any, int]]) -> None:
+        """Store several (key, value, expire) entries in a single round-trip"""
+        if not items:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value, expire in items:
+                pipe.set(key, _pack(value), ex=expire)
+            await pipe.execute()
 
     async def get_data(self, key: str) -> Optional[Any]:
         data = await self.redis.get(key)
-        return json.loads(data) if data else None
+        return _unpack(data) if data else None
+
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Fetch several keys in a single round-trip"""
+        if not keys:
+            return []
+        values = await self.redis.mget(keys)
+        return [_unpack(data) if data else None for data in values]
+
+    async def hset_data(self, name: str, mapping: Dict[str, Any]) -> None:
+        """Store several hash fields, each value packed individually"""
+        if mapping:
+            await self.redis.hset(name, mapping={field: _pack(value) for field, value in mapping.items()})
+
+    async def hgetall_data(self, name: str) -> Dict[str, Any]:
+        data = await self.redis.hgetall(name)
+        return {field.decode(): _unpack(value) for field, value in data.items()}
+
+    async def hdel_data(self, name: str, *fields: str) -> None:
+        if fields:
+            await self.redis.hdel(name, *fields)
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        expire: int = 15
+    ) -> Optional[Any]:
+        """Read-through cache where only one caller repopulates an expired key"""
+        miss_key = f"miss:{key}"
+        data, missing = await self.redis.mget(key, miss_key)
+        if data is not None:
+            return _unpack(data)
+        if missing is not None:
+            return None
+
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        if await self.redis.set(lock_key, token, nx=True, px=_LOCK_TTL_MS):
+            try:
+                value = await loader()
+                if value is not None:
+                    await self.set_data(key, value, expire=expire)
+                else:
+                    await self.redis.set(miss_key, 1, px=_MISS_TTL_MS)
+                return value
+            finally:
+                # Only release our own lock; it may have expired and been taken by another caller
+                await self.redis.eval(_RELEASE_LOCK, 1, lock_key, token)
+
+        # Another caller is repopulating - wait for its result while it still holds the lock
+        for _ in range(40):
+            await asyncio.sleep(0.05)
+            data, missing, locked = await self.redis.mget(key, miss_key, lock_key)
+            if data is not None:
+                return _unpack(data)
+            if missing is not None:
+                return None
+            if locked is None:
+                break
+
+        return await loader()
+
+    async def pipe_set_publish(
+        self,
+        key: str,
+        value: Any,
+        channel: str,
+        message: Any,
+        expire: int = 15
+    ) -> None:
+        """Store a value and publish an update in a single round-trip"""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(key, _pack(value), ex=expire)
+            pipe.publish(channel, orjson.dumps(message))
+            await pipe.execute()
 
     async def publish(self, channel: str, message: Any) -> None:
-        await self.redis.publish(channel, json.dumps(message)) 
\ No newline at end of file
+        # Subscribers get JSON; orjson also handles the datetimes in market data
+        await self.redis.publish(channel, orjson.dumps(message)) 
\ No newline at end of file
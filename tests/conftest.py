@@ -1,9 +1,15 @@
 import asyncio
+import os
 import pytest
-from httpx import AsyncClient
+import uvloop
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+# The shared lifespan must not open exchange sockets or poll orders; set before settings load
+os.environ.setdefault("ENABLE_EXCHANGE_STREAMS", "false")
+
 from src.main import app
 from src.db.base import Base
 from src.core.config import get_settings
@@ -16,7 +22,8 @@ TEST_DATABASE_URL = f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.PO
 
 @pytest.fixture(scope="session")
 def event_loop():
-    loop = asyncio.get_event_loop_policy().new_event_loop()
+    loop = uvloop.new_event_loop()
+    asyncio.set_event_loop(loop)
     yield loop
     loop.close()
 
@@ -38,7 +45,10 @@ async def test_db(test_engine):
     async with TestSessionLocal() as session:
         yield session
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 async def client():
-    async with AsyncClient(app=app, base_url="http://test") as client:
-        yield client 
\ No newline at end of file
+    # One lifespan for the whole run, so tests share its Redis/HTTP clients and services
+    async with LifespanManager(app) as manager:
+        transport = ASGITransport(app=manager.app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client 
\ No newline at end of file
@@ -1,6 +1,20 @@
+import msgspec
 import pytest
+from datetime import datetime, timezone
 from httpx import AsyncClient
 
+from src.main import app
+from src.services.data_ingestion import DataIngestionService, Kline
+
+async def _seed_latest_tick(exchange: str, trading_pair: str):
+    """Write a tick to Redis through the same path the ingestion service uses"""
+    service = DataIngestionService(redis_client=app.state.redis_client)
+    kline = Kline(
+        trading_pair.replace("-", ""), exchange, datetime(2024, 1, 1, tzinfo=timezone.utc),
+        42000.0, 42100.0, 41900.0, 42050.0, 12.5
+    )
+    await service.cache_data(exchange, trading_pair, msgspec.structs.asdict(kline))
+
 @pytest.mark.asyncio
 async def test_get_latest_market_data(client: AsyncClient):
     response = await client.get("/api/v1/market-data/latest/binance/BTC-USD")
@@ -12,4 +26,59 @@ async def test_get_historical_market_data(client: AsyncClient):
         "/api/v1/market-data/historical/binance/BTC-USD",
         params={"start_time": "2024-01-01T00:00:00Z"}
     )
-    assert response.status_code == 200 
\ No newline at end of file
+    assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_get_historical_market_data_stream(client: AsyncClient):
+    response = await client.get(
+        "/api/v1/market-data/historical/binance/BTC-USD",
+        params={"start_time": "2024-01-01T00:00:00Z", "stream": True}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+@pytest.mark.asyncio
+async def test_get_latest_market_data_batch(client: AsyncClient):
+    response = await client.get(
+        "/api/v1/market-data/latest/binance",
+        params={"pairs": "BTC-USD,ETH-USD"}
+    )
+    assert response.status_code == 200
+    assert isinstance(response.json(), dict)
+
+@pytest.mark.asyncio
+async def test_get_latest_market_data_from_ingestion_cache(client: AsyncClient):
+    await _seed_latest_tick("binance", "BTC-USD")
+
+    response = await client.get(
+        "/api/v1/market-data/latest/binance",
+        params={"pairs": "BTC-USD"}
+    )
+    assert response.status_code == 200
+    assert response.json()["BTC-USD"]["close"] == 42050.0
+
+    response = await client.get("/api/v1/market-data/latest/binance/BTC-USD")
+    assert response.status_code == 200
+    assert response.json()["close"] == 42050.0
+
+@pytest.mark.asyncio
+async def test_batch_latest_market_data_is_response_cached(client: AsyncClient):
+    await _seed_latest_tick("binance", "BTC-USD")
+    response = await client.get(
+        "/api/v1/market-data/latest/binance", params={"pairs": "BTC-USD"}
+    )
+    assert response.status_code == 200
+    cached = await app.state.redis_client.get_data(
+        "http_cache:/api/v1/market-data/latest/binance?pairs=BTC-USD"
+    )
+    assert cached["status"] == 200
+
+@pytest.mark.asyncio
+async def test_cached_response_allows_each_requesting_origin(client: AsyncClient):
+    await _seed_latest_tick("binance", "ETH-USD")
+    for origin in ("https://a.example", "https://b.example"):
+        response = await client.get(
+            "/api/v1/market-data/latest/binance/ETH-USD", headers={"Origin": origin}
+        )
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == origin
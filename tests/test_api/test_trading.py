@@ -0,0 +1,14 @@
+import pytest
+from httpx import AsyncClient
+
+@pytest.mark.asyncio
+async def test_trade_signal_body_is_documented(client: AsyncClient):
+    response = await client.get("/openapi.json")
+    paths = response.json()["paths"]
+    for path in ("/api/v1/trading/execute", "/api/v1/risk/validate-trade"):
+        body = paths[path]["post"]["requestBody"]
+        schema = body["content"]["application/json"]["schema"]
+        assert body["required"] is True
+        assert "action" in schema["required"]
+        # Enum definitions are inlined, leaving no dangling $defs refs
+        assert schema["properties"]["action"]["enum"] == ["long", "short"]
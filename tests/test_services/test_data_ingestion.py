@@ -0,0 +1,72 @@
+import asyncio
+import orjson
+import pytest
+from datetime import datetime, timezone
+
+from src.core.config import get_settings
+from src.services.data_ingestion import DataIngestionService
+
+settings = get_settings()
+
+@pytest.mark.asyncio
+async def test_stop_completes_in_flight_flush():
+    service = DataIngestionService()
+    written = []
+
+    async def slow_flush():
+        rows, service._write_buffer = service._write_buffer, []
+        await asyncio.sleep(0.1)
+        written.extend(rows)
+
+    service._flush_market_data = slow_flush
+    service._flush_task = asyncio.create_task(service._flush_loop())
+    for _ in range(3):
+        await service.store_market_data({"symbol": "BTCUSDT"})
+    # Let the loop start writing the buffer
+    await asyncio.sleep(settings.MARKET_DATA_FLUSH_INTERVAL + 0.01)
+
+    await service.stop()
+
+    assert len(written) == 3
+
+def test_binance_kline_event_is_normalized():
+    service = DataIngestionService()
+    # Shape of a kline event on the combined /stream endpoint; numbers arrive as strings
+    frame = orjson.dumps({
+        "stream": "btcusdt@kline_1m",
+        "data": {
+            "e": "kline",
+            "E": 1700000001000,
+            "s": "BTCUSDT",
+            "k": {
+                "t": 1700000000000,
+                "T": 1700000059999,
+                "s": "BTCUSDT",
+                "i": "1m",
+                "o": "50000.10",
+                "c": "50010.00",
+                "h": "50020.50",
+                "l": "49990.25",
+                "v": "12.5",
+                "x": False
+            }
+        }
+    })
+
+    kline = service.normalize_market_data("binance", frame)
+
+    assert kline.symbol == "BTCUSDT"
+    assert kline.exchange == "binance"
+    assert kline.timestamp == datetime.fromtimestamp(1700000000, timezone.utc)
+    assert (kline.open, kline.high, kline.low, kline.close, kline.volume) == (
+        50000.10, 50020.50, 49990.25, 50010.00, 12.5
+    )
+
+def test_mock_frames_decode_as_binance_stream_frames():
+    service = DataIngestionService()
+    frame = next(service._generate_mock_batch("BTC-USDT", n=1))
+
+    kline = service.normalize_market_data("mock", orjson.dumps(frame))
+
+    assert kline.symbol == "BTCUSDT"
+    assert kline.exchange == "mock"
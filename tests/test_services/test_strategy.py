@@ -0,0 +1,15 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.core.exceptions import StrategyError
+from src.services.strategy import StrategyGenerator
+
+@pytest.mark.asyncio
+async def test_failed_assistant_request_raises_strategy_error():
+    generator = StrategyGenerator()
+    generator.mock_mode = False
+    generator.client = MagicMock()
+    generator.client.beta.threads.messages.create = AsyncMock(side_effect=RuntimeError("rate limited"))
+
+    with pytest.raises(StrategyError):
+        await generator.generate_strategy({"symbol": "BTC-USDT"})
@@ -0,0 +1,189 @@
+import asyncio
+import hashlib
+import hmac
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.core.config import get_settings
+from src.db.models.trading import Trade
+from src.services import trade_executor
+from src.services.trade_executor import (
+    EXCHANGE_APIS, OrderRow, OrderTicket, TradeExecutor, create_exchange_clients
+)
+
+settings = get_settings()
+
+@pytest.mark.asyncio
+async def test_exchange_clients_are_pooled_http2():
+    clients = create_exchange_clients()
+    try:
+        for exchange, client in clients.items():
+            # httpx appends a trailing slash to the base URL path
+            assert str(client.base_url).rstrip("/") == EXCHANGE_APIS[exchange]["base_url"]
+            # Checked on the connection pool, so the test needs no network access
+            pool = client._transport._pool
+            assert pool._http2 is True
+            assert pool._max_connections == settings.EXCHANGE_MAX_CONNECTIONS
+    finally:
+        for client in clients.values():
+            await client.aclose()
+
+@pytest.mark.asyncio
+async def test_fill_updates_trade_and_stops_tracking():
+    executor = TradeExecutor(http_clients={})
+    executor._record_entry_fill = AsyncMock()
+    executor.redis_client.hdel_data = AsyncMock()
+    executor._track_order(OrderRow("42", "BTCUSDT", "LONG", 50000.0, 0.1, "NEW"))
+
+    status = {"status": "FILLED", "price": 50500.0}
+    await executor._apply_order_status("42", status)
+
+    executor._record_entry_fill.assert_awaited_once_with("42", status)
+    assert "42" not in executor.active_orders
+    assert "42" not in executor.orders_by_exchange["binance"]
+
+@pytest.mark.asyncio
+async def test_entry_fill_opens_the_trade_found_by_order_id(monkeypatch):
+    trade = Trade(
+        id=7, order_id="abc-123", symbol="BTC-PERPETUAL", direction="LONG",
+        entry_price=50000.0, quantity=0.1, status="NEW"
+    )
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(**{"scalars.return_value.first.return_value": trade})
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__.return_value = session
+    monkeypatch.setattr(trade_executor, "AsyncSessionLocal", session_factory)
+
+    executor = TradeExecutor(http_clients={})
+    executor.risk_manager.update_risk_metrics = AsyncMock()
+    await executor._record_entry_fill("abc-123", {"status": "FILLED", "price": 50100.0})
+
+    # Looked up by the exchange's order id, not the primary key
+    assert session.execute.await_args.args[1] == {"order_id": "abc-123"}
+    assert trade.status == "FILLED"
+    assert trade.entry_price == 50100.0
+    # An entry fill opens the position rather than closing it
+    assert trade.exit_time is None and trade.pnl is None
+    executor.risk_manager.update_risk_metrics.assert_awaited_once_with(trade)
+
+@pytest.mark.asyncio
+async def test_account_balance_is_fetched_and_cached():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"balances": [
+            {"asset": "BTC", "free": "0.5", "locked": "0"},
+            {"asset": "USDT", "free": "1234.5", "locked": "10"},
+        ]})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="https://api.binance.com")
+    executor = TradeExecutor(http_clients={"binance": client})
+    try:
+        assert await executor._get_cached_balance("binance") == 1234.5
+        assert await executor._get_cached_balance("binance") == 1234.5
+    finally:
+        await client.aclose()
+
+    assert len(requests) == 1
+    assert requests[0].url.path == "/api/v3/account"
+    assert "signature" in requests[0].url.params
+
+@pytest.mark.asyncio
+async def test_bulk_open_orders_request_is_signed():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=[{"orderId": 42, "status": "NEW"}])
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="https://api.binance.com")
+    executor = TradeExecutor(http_clients={"binance": client})
+    try:
+        assert await executor._check_all_order_statuses("binance") == {"42": "NEW"}
+    finally:
+        await client.aclose()
+
+    params = requests[0].url.params
+    assert requests[0].url.path == "/api/v3/openOrders"
+    expected = hmac.new(
+        (settings.BINANCE_API_SECRET or "").encode(),
+        f"timestamp={params['timestamp']}".encode(),
+        hashlib.sha256
+    ).hexdigest()
+    assert params["signature"] == expected
+
+@pytest.mark.asyncio
+async def test_stop_writes_trades_already_taken_off_the_queue():
+    executor = TradeExecutor(http_clients={})
+    written = []
+
+    async def slow_write(rows):
+        await asyncio.sleep(0.1)
+        written.extend(rows)
+
+    executor._write_trades = slow_write
+    executor._trade_writer_task = asyncio.create_task(executor._trade_writer())
+    for order_id in range(3):
+        await executor._store_trade({
+            "order_id": order_id, "symbol": "BTCUSDT", "side": "LONG",
+            "price": 50000.0, "quantity": 0.1, "status": "FILLED"
+        })
+    # Let the writer pick the batch up and start writing it
+    await asyncio.sleep(settings.TRADE_WRITE_FLUSH_INTERVAL + 0.01)
+
+    await executor.stop()
+
+    assert len(written) == 3
+
+@pytest.mark.asyncio
+async def test_stop_cancels_tickets_still_queued():
+    executor = TradeExecutor(http_clients={})
+    ticket = OrderTicket()
+    executor.tickets[ticket.ticket_id] = ticket
+    await executor._order_queue.put((ticket, None, 0.0))
+
+    await executor.stop()
+
+    assert ticket.done.is_set()
+    assert executor.tickets[ticket.ticket_id].status == "CANCELLED"
+
+@pytest.mark.asyncio
+async def test_stop_cancels_ticket_while_worker_waits_for_a_slot():
+    executor = TradeExecutor(http_clients={})
+    for _ in range(settings.ORDER_SUBMIT_CONCURRENCY):
+        await executor._submit_limiter.acquire()
+    ticket = OrderTicket()
+    executor.tickets[ticket.ticket_id] = ticket
+    await executor._order_queue.put((ticket, None, 0.0))
+    executor._submit_worker_task = asyncio.create_task(executor._submit_worker())
+    await asyncio.sleep(0)
+
+    await executor.stop()
+
+    assert ticket.done.is_set()
+    assert ticket.status == "CANCELLED"
+
+@pytest.mark.asyncio
+async def test_ticket_status_follows_the_order_after_submission():
+    executor = TradeExecutor(http_clients={})
+    executor._record_entry_fill = AsyncMock()
+    executor.redis_client.hdel_data = AsyncMock()
+
+    async def submit(trade_signal, position_size):
+        executor._track_order(OrderRow("42", "BTCUSDT", "LONG", 50000.0, 0.1, "NEW"))
+        return {"order_id": 42, "status": "NEW"}
+
+    executor._submit_order = submit
+    ticket = OrderTicket()
+    executor.tickets[ticket.ticket_id] = ticket
+    await executor._submit_limiter.acquire()
+    await executor._submit_ticket(ticket, None, 0.1)
+    assert ticket.done.is_set()
+    assert (ticket.order_id, ticket.status) == ("42", "NEW")
+
+    await executor._apply_order_status("42", {"status": "FILLED", "price": 50500.0})
+
+    assert executor.tickets[ticket.ticket_id].status == "FILLED"
+    assert "42" not in executor._tickets_by_order
@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+
+from src.utils.redis_client import RedisClient
+
+@pytest.fixture
+async def redis_client():
+    client = RedisClient()
+    await client.connect()
+    yield client
+    await client.disconnect()
+
+@pytest.mark.asyncio
+async def test_get_or_set_loads_a_missing_key_once(redis_client: RedisClient):
+    key = "test:get_or_set:absent"
+    await redis_client.redis.delete(key, f"miss:{key}", f"lock:{key}")
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return None
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    results = await asyncio.gather(*(redis_client.get_or_set(key, loader) for _ in range(5)))
+
+    assert results == [None] * 5
+    # Waiters see the remembered miss instead of polling out and loading themselves
+    assert calls == 1
+    assert loop.time() - started < 1.0
+    assert await redis_client.get_or_set(key, loader) is None
+    assert calls == 1
+
+@pytest.mark.asyncio
+async def test_get_or_set_leaves_a_lock_it_does_not_own(redis_client: RedisClient):
+    key = "test:get_or_set:stolen"
+    await redis_client.redis.delete(key, f"miss:{key}", f"lock:{key}")
+
+    async def slow_loader():
+        # Our lock expires and another caller takes it while we are still loading
+        await redis_client.redis.set(f"lock:{key}", "other-owner", px=3000)
+        return {"close": 1.0}
+
+    assert await redis_client.get_or_set(key, slow_loader) == {"close": 1.0}
+    assert await redis_client.redis.get(f"lock:{key}") == b"other-owner"
+
+@pytest.mark.asyncio
+async def test_set_many_stores_every_entry_with_its_ttl(redis_client: RedisClient):
+    await redis_client.set_many([
+        ("test:set_many:a", {"close": 1.0}, 15),
+        ("test:set_many:b", {"close": 2.0}, 30),
+    ])
+    assert await redis_client.mget(["test:set_many:a", "test:set_many:b"]) == [
+        {"close": 1.0}, {"close": 2.0}
+    ]
+    assert 0 < await redis_client.redis.ttl("test:set_many:b") <= 30